@@ -0,0 +1,266 @@
+"""Admission control for the AI service endpoints.
+
+Every request is charged a cost (text tokens, voice seconds or report size,
+weighted per endpoint) against a per-user token bucket, then waits for a
+slot in a priority gate so interactive calls are served ahead of bulk work.
+Bucket state lives in memory, or in SQLite when ``ADMISSION_SQLITE_PATH`` is
+set so several worker processes share one budget.
+"""
+import asyncio
+import math
+import os
+import sqlite3
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from enum import IntEnum
+
+from fastapi import HTTPException
+
+
+class Priority(IntEnum):
+    INTERACTIVE = 0
+    STANDARD = 1
+    BULK = 2
+
+
+# Cost of a request in bucket credits is base + per_unit * units, where units
+# are text tokens, voice seconds or check-ins depending on the endpoint.
+ENDPOINT_POLICIES = {
+    "/analyze-text": {"priority": Priority.INTERACTIVE, "base": 1.0, "per_unit": 0.01},
+    "/generate-recommendations": {"priority": Priority.INTERACTIVE, "base": 0.5, "per_unit": 0.0},
+    "/analyze-voice": {"priority": Priority.STANDARD, "base": 2.0, "per_unit": 0.5},
+    "/generate-summary": {"priority": Priority.STANDARD, "base": 1.0, "per_unit": 0.002},
+    "/generate-pdf-report": {"priority": Priority.BULK, "base": 5.0, "per_unit": 0.01},
+    "/generate-summaries": {"priority": Priority.BULK, "base": 5.0, "per_unit": 0.001},
+}
+
+# How long each class may queue for a slot before being shed with a 503
+QUEUE_TIMEOUTS = {
+    Priority.INTERACTIVE: 10.0,
+    Priority.STANDARD: 30.0,
+    Priority.BULK: 5.0,
+}
+
+
+def count_text_tokens(text):
+    """Cheap token estimate used for costing; whitespace words are close enough."""
+    return len(text.split())
+
+
+# Rough upload bytes per second of speech, used to cost voice requests before
+# decoding: 16 kHz 16-bit mono WAV, 128 kbps MP3 and 32 kbps Opus in WebM
+AUDIO_BYTES_PER_SECOND = {".wav": 32000, ".mp3": 16000, ".webm": 4000}
+
+
+def estimate_audio_seconds(num_bytes, extension):
+    """Upper-end duration estimate from the upload size, so costing needs no decode."""
+    return num_bytes / AUDIO_BYTES_PER_SECOND.get(extension, 4000)
+
+
+def request_cost(endpoint, units=0):
+    policy = ENDPOINT_POLICIES[endpoint]
+    return policy["base"] + policy["per_unit"] * units
+
+
+class MemoryBucketStore:
+    """Per-user token buckets held in process memory."""
+
+    def __init__(self):
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def take(self, user_id, cost, capacity, refill_rate, now):
+        """Consume ``cost`` credits; return seconds to wait (0 when admitted)."""
+        with self._lock:
+            tokens, updated = self._buckets.get(user_id, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * refill_rate)
+            if tokens >= cost:
+                self._buckets[user_id] = (tokens - cost, now)
+                return 0.0
+            self._buckets[user_id] = (tokens, now)
+            return (cost - tokens) / refill_rate
+
+    def refund(self, user_id, credits, capacity, refill_rate, now):
+        """Return ``credits`` to a bucket, e.g. for a request that was never served."""
+        with self._lock:
+            tokens, updated = self._buckets.get(user_id, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * refill_rate + credits)
+            self._buckets[user_id] = (tokens, now)
+
+
+class SQLiteBucketStore:
+    """Per-user token buckets persisted in SQLite, shared between processes."""
+
+    def __init__(self, path):
+        self._conn = sqlite3.connect(path, timeout=5.0, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS buckets (user_id TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+        )
+        self._lock = threading.Lock()
+
+    def take(self, user_id, cost, capacity, refill_rate, now):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT tokens, updated FROM buckets WHERE user_id = ?", (user_id,)
+                ).fetchone()
+                tokens, updated = row if row else (capacity, now)
+                tokens = min(capacity, tokens + max(0.0, now - updated) * refill_rate)
+                wait = 0.0
+                if tokens >= cost:
+                    tokens -= cost
+                else:
+                    wait = (cost - tokens) / refill_rate
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO buckets (user_id, tokens, updated) VALUES (?, ?, ?)",
+                    (user_id, tokens, now),
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            return wait
+
+    def refund(self, user_id, credits, capacity, refill_rate, now):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT tokens, updated FROM buckets WHERE user_id = ?", (user_id,)
+                ).fetchone()
+                tokens, updated = row if row else (capacity, now)
+                tokens = min(capacity, tokens + max(0.0, now - updated) * refill_rate + credits)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO buckets (user_id, tokens, updated) VALUES (?, ?, ?)",
+                    (user_id, tokens, now),
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+
+class PriorityGate:
+    """Bounded concurrency where lower priority classes get a smaller share.
+
+    A class may start while fewer than ``limits[priority]`` requests are in
+    flight and no higher priority request is waiting, so bulk work can never
+    occupy the slots interactive calls need.
+    """
+
+    def __init__(self, slots):
+        self.limits = {
+            Priority.INTERACTIVE: slots,
+            Priority.STANDARD: max(1, slots - 1),
+            Priority.BULK: max(1, slots // 2),
+        }
+        self.in_flight = 0
+        self._waiting = {priority: 0 for priority in Priority}
+        self._condition = asyncio.Condition()
+
+    def _can_start(self, priority):
+        if self.in_flight >= self.limits[priority]:
+            return False
+        return not any(self._waiting[p] for p in Priority if p < priority)
+
+    async def acquire(self, priority, timeout):
+        async with self._condition:
+            self._waiting[priority] += 1
+            try:
+                await asyncio.wait_for(self._condition.wait_for(lambda: self._can_start(priority)), timeout)
+                self.in_flight += 1
+                return True
+            except asyncio.TimeoutError:
+                return False
+            finally:
+                self._waiting[priority] -= 1
+                # Lower priority waiters may have been held back only by us waiting
+                self._condition.notify_all()
+
+    async def release(self):
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+
+class AdmissionController:
+    def __init__(self, store, capacity, refill_rate, slots, asr_slots, enabled=True):
+        self.store = store
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.gate = PriorityGate(slots)
+        self.asr_slots = asr_slots
+        self.asr_in_flight = 0
+        self.enabled = enabled
+
+    def charge(self, user_id, endpoint, units=0):
+        """Charge the user's bucket, raising 429 with Retry-After when it is empty.
+
+        Returns the number of credits taken.
+        """
+        if not self.enabled:
+            return 0.0
+        cost = min(request_cost(endpoint, units), self.capacity)
+        wait = self.store.take(user_id, cost, self.capacity, self.refill_rate, time.time())
+        if wait > 0:
+            raise HTTPException(
+                status_code=429,
+                detail="Rate limit exceeded",
+                headers={"Retry-After": str(math.ceil(wait))},
+            )
+        return cost
+
+    @asynccontextmanager
+    async def admit(self, user_id, endpoint, units=0):
+        """Charge the request, then hold a priority slot for the duration of the block.
+
+        Use this around work offloaded to the threadpool; handlers that stay
+        on the event loop only need :meth:`charge`. A request shed with 503
+        gets its credits back, so retries during overload do not drain the
+        user's bucket.
+        """
+        cost = self.charge(user_id, endpoint, units)
+        if not self.enabled:
+            yield
+            return
+
+        priority = ENDPOINT_POLICIES[endpoint]["priority"]
+        if not await self.gate.acquire(priority, QUEUE_TIMEOUTS[priority]):
+            self.store.refund(user_id, cost, self.capacity, self.refill_rate, time.time())
+            raise HTTPException(
+                status_code=503,
+                detail="Service busy, please retry",
+                headers={"Retry-After": "5"},
+            )
+        try:
+            yield
+        finally:
+            await self.gate.release()
+
+    @contextmanager
+    def asr_slot(self):
+        """Yield True if a speech recognition slot was free, False if ASR is saturated."""
+        if self.enabled and self.asr_in_flight >= self.asr_slots:
+            yield False
+            return
+        self.asr_in_flight += 1
+        try:
+            yield True
+        finally:
+            self.asr_in_flight -= 1
+
+
+def controller_from_env():
+    sqlite_path = os.getenv("ADMISSION_SQLITE_PATH")
+    store = SQLiteBucketStore(sqlite_path) if sqlite_path else MemoryBucketStore()
+    return AdmissionController(
+        store,
+        capacity=float(os.getenv("ADMISSION_BUCKET_CAPACITY", "60")),
+        refill_rate=float(os.getenv("ADMISSION_REFILL_PER_SECOND", "1")),
+        slots=int(os.getenv("ADMISSION_SLOTS", "4")),
+        asr_slots=int(os.getenv("ADMISSION_ASR_SLOTS", "2")),
+        enabled=os.getenv("ADMISSION_ENABLED", "1") == "1",
+    )
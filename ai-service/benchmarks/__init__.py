@@ -0,0 +1,5 @@
+"""Benchmark suite for the AI service.
+
+Run from the ``ai-service`` directory, e.g. ``python -m benchmarks stages``
+or ``python -m benchmarks load``. See ``python -m benchmarks --help``.
+"""
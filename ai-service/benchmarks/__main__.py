@@ -0,0 +1,111 @@
+"""Command line entry point: ``python -m benchmarks {stages,load,streaming,bulk,fusion,soak,all}``."""
+import argparse
+import os
+import sys
+
+from benchmarks.report import print_table, write_json
+
+STAGE_COLUMNS = ["stage", "input", "count", "mean_ms", "p50_ms", "p90_ms", "p99_ms", "max_ms"]
+STREAMING_COLUMNS = ["format", "rows", "peak_mib", "seconds", "rows_per_s", "plot_points"]
+BULK_COLUMNS = ["users", "check_ins", "load_s", "groupby_s", "render_s", "users_per_s"]
+FUSION_COLUMNS = ["model", "samples", "accuracy", "nll", "brier", "ece"]
+FUSION_LATENCY_COLUMNS = ["model", "batch", "ms_per_batch", "us_per_clip"]
+SOAK_COLUMNS = ["metric", "start", "end", "per_round", "per_request", "rising", "leak"]
+SOAK_ENDPOINT_COLUMNS = ["endpoint", "requests", "errors", "mean_ms", "rss_kib", "fds", "temp_entries", "traced_kib"]
+SOAK_ALLOCATION_COLUMNS = ["location", "size_diff", "count_diff"]
+LOAD_COLUMNS = ["endpoint", "offered_rps", "throughput_rps", "count", "rejected", "shed", "degraded", "errors", "p50_ms", "p90_ms", "p99_ms", "max_ms"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AI service benchmarks")
+    parser.add_argument("suite", choices=["stages", "load", "streaming", "bulk", "fusion", "soak", "all"])
+    parser.add_argument("--real-models", action="store_true",
+                        help="use the Hugging Face models instead of the offline tiny models")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per stage case")
+    parser.add_argument("--rate", type=float, default=5.0, help="offered load in requests/second")
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds of load per endpoint")
+    parser.add_argument("--endpoint", action="append", dest="endpoints",
+                        help="endpoint to load (repeatable); defaults to all")
+    parser.add_argument("--admission", action="store_true",
+                        help="keep admission control enabled during the load test")
+    parser.add_argument("--rows", type=int, action="append",
+                        help="history length for the streaming benchmark (repeatable)")
+    parser.add_argument("--users", type=int, action="append",
+                        help="user count for the bulk summary benchmark (repeatable)")
+    parser.add_argument("--fusion-data", help="labeled .npz features for the fusion evaluation")
+    parser.add_argument("--fusion-clips", help="CSV of labeled clips (path,mood[,transcript]) for the fusion evaluation")
+    parser.add_argument("--save-fusion", help="write the trained fusion model to this .npz path")
+    parser.add_argument("--rounds", type=int, default=12, help="soak rounds between resource samples")
+    parser.add_argument("--requests-per-round", type=int, default=10,
+                        help="sequential requests per endpoint in each soak round")
+    parser.add_argument("--trace-frames", type=int, default=0,
+                        help="tracemalloc frames during the soak (slow); 0 tracks RSS, fds and temp files only")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--json", help="also write results to this JSON file")
+    args = parser.parse_args()
+    if args.save_fusion and not (args.fusion_data or args.fusion_clips):
+        parser.error("--save-fusion needs real labeled data (--fusion-data or --fusion-clips), not synthetic features")
+
+    if not args.real_models:
+        os.environ["AI_SERVICE_TINY_MODELS"] = "1"
+
+    results = {}
+
+    if args.suite in ("stages", "all"):
+        from benchmarks import stages
+        results["stages"] = stages.run(repeat=args.repeat)
+        print_table(results["stages"], STAGE_COLUMNS)
+        print()
+
+    if args.suite in ("streaming", "all"):
+        from benchmarks import streaming
+        results["streaming"] = streaming.run(args.rows)
+        print_table(results["streaming"], STREAMING_COLUMNS)
+        print()
+
+    if args.suite in ("bulk", "all"):
+        from benchmarks import bulk
+        results["bulk"] = bulk.run(args.users)
+        print_table(results["bulk"], BULK_COLUMNS)
+        print()
+
+    if args.suite in ("fusion", "all"):
+        from benchmarks import fusion_eval
+        results["fusion"], results["fusion_latency"] = fusion_eval.run(
+            data=args.fusion_data, clips=args.fusion_clips, save=args.save_fusion,
+        )
+        print_table(results["fusion"], FUSION_COLUMNS)
+        print()
+        print_table(results["fusion_latency"], FUSION_LATENCY_COLUMNS)
+        print()
+
+    if args.suite in ("load", "all"):
+        from benchmarks import load
+        results["load"] = load.run(
+            port=args.port, rate=args.rate, duration=args.duration,
+            endpoints=args.endpoints, tiny_models=not args.real_models, admission=args.admission,
+        )
+        print_table(results["load"], LOAD_COLUMNS)
+        print()
+
+    if args.suite in ("soak", "all"):
+        from benchmarks import soak
+        results["soak"], results["soak_endpoints"], results["soak_allocations"] = soak.run(
+            port=args.port + 1, rounds=args.rounds, requests_per_round=args.requests_per_round,
+            endpoints=args.endpoints, tiny_models=not args.real_models, trace_frames=args.trace_frames,
+        )
+        print_table(results["soak"], SOAK_COLUMNS)
+        print()
+        print_table(results["soak_endpoints"], SOAK_ENDPOINT_COLUMNS)
+        print()
+        print_table(results["soak_allocations"], SOAK_ALLOCATION_COLUMNS)
+
+    if args.json:
+        write_json(results, args.json)
+
+    if any(row["leak"] for row in results.get("soak", [])):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Throughput of the bulk weekly summary job in users per second."""
+import time
+
+import numpy as np
+
+from bulk_summary import load_columnar, render_summaries, summarize_users
+from benchmarks.synthetic import MOODS
+
+USER_COUNTS = [10_000, 100_000]
+CHECK_INS_PER_USER = 7
+
+
+def columnar_check_ins(n_users, per_user=CHECK_INS_PER_USER, seed=0):
+    """A ``/generate-summaries`` payload: one list per column, rows grouped by user."""
+    rng = np.random.default_rng(seed)
+    n_rows = n_users * per_user
+    return {
+        "userId": np.repeat([f"user-{i}" for i in range(n_users)], per_user).tolist(),
+        "mood": np.asarray(MOODS)[rng.integers(0, len(MOODS), n_rows)].tolist(),
+        "moodScore": rng.integers(1, 11, n_rows).tolist(),
+        "energyLevel": rng.integers(1, 11, n_rows).tolist(),
+    }
+
+
+def measure(n_users):
+    columns = columnar_check_ins(n_users)
+
+    started = time.perf_counter()
+    check_ins = load_columnar(columns)
+    loaded = time.perf_counter()
+    stats = summarize_users(check_ins)
+    aggregated = time.perf_counter()
+    summaries = render_summaries(stats)
+    finished = time.perf_counter()
+
+    assert len(summaries) == n_users
+    return {
+        "users": n_users,
+        "check_ins": len(check_ins),
+        "load_s": loaded - started,
+        "groupby_s": aggregated - loaded,
+        "render_s": finished - aggregated,
+        "users_per_s": n_users / (finished - started),
+    }
+
+
+def run(user_counts=None):
+    return [measure(n) for n in user_counts or USER_COUNTS]
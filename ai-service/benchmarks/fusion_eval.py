@@ -0,0 +1,154 @@
+"""Offline evaluation of the voice-and-text fusion models.
+
+Labeled data comes from one of three sources:
+
+* synthetic feature vectors (default), where a share of samples carry
+  misleading text so the acoustic signal matters;
+* an ``.npz`` file with ``text_features``, ``acoustic_features`` and ``labels``;
+* a CSV of local audio clips (``path,mood[,transcript]``), featurized through
+  ``main``'s pipelines (the tiny models unless ``--real-models`` is given).
+
+Each model is scored on a held-out split for accuracy, negative
+log-likelihood, Brier score and expected calibration error. Batched scoring
+latency is reported too.
+"""
+import csv
+import time
+
+import numpy as np
+
+from fusion import (
+    ACOUSTIC_DIM, CENTROID, EMOTION_LABELS, MOODS, RMS, TEMPO, ZCR,
+    PriorFusion, acoustic_feature_vector, fit_linear_fusion, text_feature_vector,
+)
+
+# Per mood: P(positive) beta parameters, dominant emotion, and (rms, tempo, zcr, centroid) means
+_SYNTHETIC_CLASSES = {
+    "happy": ((8, 2), "joy", (0.13, 135, 0.07, 2200)),
+    "neutral": ((4, 4), "neutral", (0.07, 110, 0.08, 1800)),
+    "sad": ((2, 8), "sadness", (0.035, 90, 0.09, 2400)),
+    "anxious": ((2, 6), "fear", (0.13, 140, 0.14, 2600)),
+    "angry": ((2, 7), "anger", (0.15, 125, 0.12, 2800)),
+    "tired": ((3, 5), "neutral", (0.06, 85, 0.06, 1500)),
+}
+_ACOUSTIC_NOISE = (0.02, 12, 0.02, 250)
+
+BATCH_SIZES = [1, 64, 1024]
+
+
+def synthetic_dataset(n_samples=6000, misleading_text=0.3, seed=0):
+    """Return ``(text_features, acoustic_features, labels)`` with integer mood labels."""
+    rng = np.random.default_rng(seed)
+    labels = rng.integers(0, len(MOODS), n_samples)
+
+    # Some people mask how they feel in words; their text follows another mood
+    text_moods = np.where(rng.random(n_samples) < misleading_text, rng.integers(0, len(MOODS), n_samples), labels)
+
+    text = np.empty((n_samples, 2 + len(EMOTION_LABELS)))
+    acoustic = rng.normal(0, 1, (n_samples, ACOUSTIC_DIM))
+    for index, mood in enumerate(MOODS):
+        (a, b), emotion, means = _SYNTHETIC_CLASSES[mood]
+
+        rows = text_moods == index
+        positive = rng.beta(a, b, rows.sum())
+        text[rows, 0], text[rows, 1] = 1 - positive, positive
+        alpha = np.ones(len(EMOTION_LABELS))
+        alpha[EMOTION_LABELS.index(emotion)] = 6
+        text[rows, 2:] = rng.dirichlet(alpha, rows.sum())
+
+        rows = labels == index
+        for column, mean, noise in zip((RMS, TEMPO, ZCR, CENTROID), means, _ACOUSTIC_NOISE):
+            acoustic[rows, column] = rng.normal(mean, noise, rows.sum())
+
+    acoustic[:, RMS] = np.clip(acoustic[:, RMS], 0.001, None)
+    return text, acoustic, labels
+
+
+def load_npz(path):
+    data = np.load(path)
+    labels = np.array([MOODS.index(str(mood)) for mood in data["labels"]])
+    return data["text_features"], data["acoustic_features"], labels
+
+
+def features_from_clips(csv_path):
+    """Featurize labeled clips with the service's own pipelines."""
+    import main
+
+    text, acoustic, labels = [], [], []
+    with open(csv_path, newline="") as f:
+        for row in csv.DictReader(f):
+            transcript = row.get("transcript") or main.speech_pipeline(row["path"])["text"]
+            analysis = main.analyze_text_sentiment(transcript) if transcript.strip() else None
+            text.append(text_feature_vector(analysis))
+            acoustic.append(acoustic_feature_vector(main.extract_audio_features(row["path"])))
+            labels.append(MOODS.index(row["mood"]))
+    return np.array(text), np.array(acoustic), np.array(labels)
+
+
+def metrics(probs, labels, n_bins=15):
+    rows = np.arange(len(labels))
+    confidence = probs.max(axis=1)
+    correct = probs.argmax(axis=1) == labels
+
+    ece = 0.0
+    bins = np.minimum((confidence * n_bins).astype(int), n_bins - 1)
+    for b in range(n_bins):
+        in_bin = bins == b
+        if in_bin.any():
+            ece += in_bin.mean() * abs(correct[in_bin].mean() - confidence[in_bin].mean())
+
+    one_hot = np.eye(probs.shape[1])[labels]
+    return {
+        "accuracy": float(correct.mean()),
+        "nll": float(-np.log(probs[rows, labels] + 1e-12).mean()),
+        "brier": float(((probs - one_hot) ** 2).sum(axis=1).mean()),
+        "ece": float(ece),
+    }
+
+
+def scoring_latency(model, text, acoustic, repeat=20):
+    rows = []
+    for batch in BATCH_SIZES:
+        idx = np.arange(batch) % len(text)
+        t, a = text[idx], acoustic[idx]
+        model.predict_proba(t, a)
+        started = time.perf_counter()
+        for _ in range(repeat):
+            model.predict_proba(t, a)
+        elapsed = (time.perf_counter() - started) / repeat
+        rows.append({"batch": batch, "ms_per_batch": elapsed * 1000, "us_per_clip": elapsed / batch * 1e6})
+    return rows
+
+
+def run(data=None, clips=None, n_samples=6000, save=None, test_fraction=0.3, seed=0):
+    """Evaluate text-only, voice-only, prior and trained fusion; returns (quality_rows, latency_rows)."""
+    if save and not (clips or data):
+        raise ValueError("Refusing to save a fusion model trained on synthetic features")
+    if clips:
+        text, acoustic, labels = features_from_clips(clips)
+    elif data:
+        text, acoustic, labels = load_npz(data)
+    else:
+        text, acoustic, labels = synthetic_dataset(n_samples, seed=seed)
+
+    order = np.random.default_rng(seed).permutation(len(labels))
+    n_test = max(1, int(len(labels) * test_fraction))
+    test, train = order[:n_test], order[n_test:]
+
+    prior = PriorFusion()
+    trained = fit_linear_fusion(text[train], acoustic[train], labels[train], seed=seed)
+    if save:
+        trained.save(save)
+
+    candidates = {
+        "text only": prior.text_distribution(text[test]),
+        "voice rules only": prior.voice_distribution(acoustic[test]),
+        "prior fusion": prior.predict_proba(text[test], acoustic[test]),
+        "trained fusion": trained.predict_proba(text[test], acoustic[test]),
+    }
+    quality = [{"model": name, "samples": len(test), **metrics(probs, labels[test])} for name, probs in candidates.items()]
+
+    latency = []
+    for name, model in (("prior fusion", prior), ("trained fusion", trained)):
+        latency.extend({"model": name, **row} for row in scoring_latency(model, text, acoustic))
+    return quality, latency
@@ -0,0 +1,148 @@
+"""Open-loop HTTP load test against a locally started AI service.
+
+Requests are issued on a Poisson schedule that does not wait for earlier
+responses, and latency is measured from each request's *scheduled* send
+time, so a slow server shows up as queueing delay instead of silently
+lowering the offered load.
+
+Admission control is disabled on the benchmark server by default, since all
+requests come from one user and would otherwise mostly measure ``429``
+responses. With ``admission=True`` rate-limited (``429``), shed (``503``)
+and degraded voice responses are counted separately and left out of the
+latency figures.
+"""
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import jwt
+import requests
+
+from benchmarks import synthetic
+from benchmarks.report import summarize
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCH_SECRET = "benchmark-secret"
+
+
+def start_server(port, tiny_models=True, timeout=300, extra_env=None):
+    """Start ``uvicorn main:app`` on ``port`` and wait until /health answers."""
+    env = dict(os.environ, JWT_SECRET=BENCH_SECRET, **(extra_env or {}))
+    if tiny_models:
+        env["AI_SERVICE_TINY_MODELS"] = "1"
+
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=SERVICE_DIR,
+        env=env,
+    )
+
+    url = f"http://127.0.0.1:{port}/health"
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"AI service exited with code {process.returncode}")
+        try:
+            if requests.get(url, timeout=1).ok:
+                return process
+        except requests.ConnectionError:
+            pass
+        time.sleep(0.5)
+
+    process.terminate()
+    raise RuntimeError("AI service did not become healthy in time")
+
+
+def auth_headers(user_id="bench-user", secret=BENCH_SECRET):
+    token = jwt.encode({"user": {"id": user_id}}, secret, algorithm="HS256")
+    return {"Authorization": f"Bearer {token}"}
+
+
+def build_scenarios(temp_dir, audio_seconds=5, history_size=30):
+    """Request factories per endpoint; each returns kwargs for ``requests.post``."""
+    texts = synthetic.text_corpus(200, 40)
+    clip_path = synthetic.write_audio_clip(os.path.join(temp_dir, "load_clip.wav"), audio_seconds)
+    with open(clip_path, "rb") as f:
+        clip = f.read()
+    history = synthetic.check_in_history(history_size)
+
+    return {
+        "/analyze-text": lambda i: {"json": {"text": texts[i % len(texts)]}},
+        "/analyze-voice": lambda i: {"files": {"audio": ("clip.wav", clip, "audio/wav")}},
+        "/generate-summary": lambda i: {"json": {"checkIns": history}},
+        "/generate-pdf-report": lambda i: {"json": {"checkIns": history}},
+    }
+
+
+def run_open_loop(base_url, endpoint, make_request, rate, duration, headers, max_workers=64, seed=0):
+    """Offer ``rate`` req/s to ``endpoint`` for ``duration`` seconds and summarize the results."""
+    rng = random.Random(seed)
+    schedule = []
+    t = 0.0
+    while True:
+        t += rng.expovariate(rate)
+        if t >= duration:
+            break
+        schedule.append(t)
+
+    url = base_url + endpoint
+
+    def fire(i, offset):
+        delay = start + offset - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        try:
+            response = requests.post(url, headers=headers, timeout=120, **make_request(i))
+        except requests.RequestException:
+            return "error", time.perf_counter() - (start + offset)
+        latency = time.perf_counter() - (start + offset)
+        if response.status_code == 429:
+            return "rejected", latency
+        if response.status_code == 503:
+            return "shed", latency
+        if not response.ok:
+            return "error", latency
+        if response.headers.get("content-type", "").startswith("application/json") and response.json().get("degraded"):
+            return "degraded", latency
+        return "ok", latency
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        results = list(pool.map(fire, range(len(schedule)), schedule))
+    elapsed = time.perf_counter() - start
+
+    outcomes = [outcome for outcome, _ in results]
+    stats = summarize([latency for outcome, latency in results if outcome == "ok"], elapsed)
+    stats.update({
+        "endpoint": endpoint,
+        "offered_rps": rate,
+        "rejected": outcomes.count("rejected"),
+        "shed": outcomes.count("shed"),
+        "degraded": outcomes.count("degraded"),
+        "errors": outcomes.count("error"),
+    })
+    return stats
+
+
+def run(port=8765, rate=5.0, duration=20.0, endpoints=None, tiny_models=True, max_workers=64, admission=False):
+    """Start a local server, drive each endpoint in turn and return one row per endpoint."""
+    rows = []
+    extra_env = None if admission else {"ADMISSION_ENABLED": "0"}
+    process = start_server(port, tiny_models=tiny_models, extra_env=extra_env)
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            scenarios = build_scenarios(temp_dir)
+            headers = auth_headers()
+            for endpoint in endpoints or scenarios:
+                rows.append(run_open_loop(
+                    f"http://127.0.0.1:{port}", endpoint, scenarios[endpoint],
+                    rate, duration, headers, max_workers=max_workers,
+                ))
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+    return rows
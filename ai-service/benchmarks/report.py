@@ -0,0 +1,56 @@
+"""Timing helpers and result formatting shared by the benchmarks."""
+import json
+import time
+
+import numpy as np
+
+
+def summarize(latencies, elapsed=None):
+    """Latency percentiles in milliseconds, plus throughput if ``elapsed`` is given."""
+    values = np.asarray(latencies, dtype=float) * 1000
+    if values.size == 0:
+        return {"count": 0}
+
+    stats = {
+        "count": int(values.size),
+        "mean_ms": float(values.mean()),
+        "p50_ms": float(np.percentile(values, 50)),
+        "p90_ms": float(np.percentile(values, 90)),
+        "p99_ms": float(np.percentile(values, 99)),
+        "max_ms": float(values.max()),
+    }
+    if elapsed:
+        stats["throughput_rps"] = values.size / elapsed
+    return stats
+
+
+def time_call(fn, repeat=5, warmup=1):
+    """Call ``fn`` ``warmup + repeat`` times and summarize the timed runs."""
+    for _ in range(warmup):
+        fn()
+
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - start)
+    return summarize(latencies)
+
+
+def print_table(rows, columns):
+    """Print ``rows`` (a list of dicts) as an aligned text table."""
+    def fmt(value):
+        return f"{value:.2f}" if isinstance(value, float) else str(value)
+
+    cells = [[fmt(row.get(col, "")) for col in columns] for row in rows]
+    widths = [max([len(col)] + [len(r[i]) for r in cells]) for i, col in enumerate(columns)]
+
+    print("  ".join(col.ljust(w) for col, w in zip(columns, widths)))
+    print("  ".join("-" * w for w in widths))
+    for r in cells:
+        print("  ".join(cell.ljust(w) for cell, w in zip(r, widths)))
+
+
+def write_json(rows, path):
+    with open(path, "w") as f:
+        json.dump(rows, f, indent=2)
@@ -0,0 +1,125 @@
+"""Soak test that looks for steady resource growth across many requests.
+
+A local server is started with ``AI_SERVICE_PROFILING=1`` and every endpoint
+is driven sequentially for a number of rounds. After each round the process
+readings from ``/debug/profile`` (RSS, open file descriptors, temp directory
+entries and bytes, and tracemalloc-traced memory when ``trace_frames`` is
+set) are recorded. Model, numba and matplotlib caches fill up over the
+first few dozen requests, so the first third of the rounds is treated as
+warmup by default. Over the remaining rounds a metric is flagged as a leak
+when its least-squares growth per request exceeds a threshold *and* it rose
+in most rounds, so one-off jumps are not reported.
+"""
+import secrets
+import tempfile
+
+import requests
+
+from benchmarks.load import auth_headers, build_scenarios, start_server
+
+# Growth per request above which a steadily rising metric is reported
+LEAK_THRESHOLDS = {
+    "rss": 16 * 1024,
+    "fds": 0.05,
+    "temp_entries": 0.05,
+    "temp_bytes": 4 * 1024,
+    "traced": 4 * 1024,
+}
+RISING_SHARE = 0.8
+
+
+def _slope(values):
+    n = len(values)
+    mean_x = (n - 1) / 2
+    mean_y = sum(values) / n
+    num = sum((x - mean_x) * (y - mean_y) for x, y in enumerate(values))
+    den = sum((x - mean_x) ** 2 for x in range(n))
+    return num / den if den else 0.0
+
+
+def trends(samples, requests_per_round, warmup_rounds):
+    """One row per metric with its growth per round and per request and whether it looks like a leak."""
+    steady = samples[warmup_rounds:]
+    rows = []
+    for metric, threshold in LEAK_THRESHOLDS.items():
+        values = [sample[metric] for sample in steady]
+        slope = _slope(values) if len(values) > 1 else 0.0
+        steps = list(zip(values, values[1:]))
+        rising = sum(b > a for a, b in steps) / len(steps) if steps else 0.0
+        per_request = slope / requests_per_round
+        rows.append({
+            "metric": metric,
+            "start": values[0] if values else None,
+            "end": values[-1] if values else None,
+            "per_round": slope,
+            "per_request": per_request,
+            "rising": rising,
+            "leak": per_request > threshold and rising >= RISING_SHARE,
+        })
+    return rows
+
+
+def endpoint_rows(report, errors):
+    """Average resource deltas per request for each endpoint from a profile report."""
+    rows = []
+    for endpoint, stats in sorted(report["endpoints"].items()):
+        count = stats["requests"]
+        deltas = stats["deltas"]
+        rows.append({
+            "endpoint": endpoint,
+            "requests": count,
+            "errors": errors.get(endpoint, 0),
+            "mean_ms": stats["seconds"] / count * 1000,
+            "rss_kib": deltas["rss"] / count / 1024,
+            "fds": deltas["fds"] / count,
+            "temp_entries": deltas["temp_entries"] / count,
+            "traced_kib": deltas["traced"] / count / 1024,
+        })
+    return rows
+
+
+def run(port=8766, rounds=12, requests_per_round=10, endpoints=None, tiny_models=True, warmup_rounds=None,
+        trace_frames=0, top=10):
+    """Soak each endpoint and return ``(trend_rows, endpoint_rows, allocation_rows)``."""
+    profiling_token = secrets.token_hex(16)
+    extra_env = {
+        "AI_SERVICE_PROFILING": "1",
+        "AI_SERVICE_PROFILING_TOKEN": profiling_token,
+        "AI_SERVICE_PROFILING_FRAMES": str(trace_frames),
+        # Keep admission control in the request path without rejecting the soak traffic
+        "ADMISSION_BUCKET_CAPACITY": "1e12",
+    }
+    base_url = f"http://127.0.0.1:{port}"
+    headers = auth_headers()
+    debug_headers = dict(headers, **{"X-Profiling-Token": profiling_token})
+    samples = []
+    errors = {}
+
+    process = start_server(port, tiny_models=tiny_models, extra_env=extra_env)
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            scenarios = build_scenarios(temp_dir)
+            endpoints = endpoints or list(scenarios)
+            requests.post(base_url + "/debug/profile/reset", headers=debug_headers, timeout=60).raise_for_status()
+
+            for _ in range(rounds):
+                for endpoint in endpoints:
+                    for i in range(requests_per_round):
+                        response = requests.post(base_url + endpoint, headers=headers, timeout=120, **scenarios[endpoint](i))
+                        if not response.ok:
+                            errors[endpoint] = errors.get(endpoint, 0) + 1
+                response = requests.get(base_url + "/debug/profile", params={"top": 0}, headers=debug_headers, timeout=120)
+                response.raise_for_status()
+                samples.append(response.json()["process"])
+
+            response = requests.get(base_url + "/debug/profile", params={"top": top}, headers=debug_headers, timeout=120)
+            response.raise_for_status()
+            report = response.json()
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+    if warmup_rounds is None:
+        warmup_rounds = rounds // 3
+    rows = trends(samples, requests_per_round * len(endpoints), warmup_rounds)
+    return rows, endpoint_rows(report, errors), report["top_allocations"]
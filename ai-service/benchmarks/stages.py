@@ -0,0 +1,43 @@
+"""Micro-benchmarks for the individual processing stages in ``main.py``."""
+import os
+import shutil
+import tempfile
+
+from benchmarks import synthetic
+from benchmarks.report import time_call
+
+TEXT_LENGTHS = [10, 60, 300]
+AUDIO_SECONDS = [1, 5, 15, 30]
+HISTORY_SIZES = [7, 90, 1000]
+
+
+def _pdf_report(main, history):
+    pdf_path = main.generate_mood_summary_pdf(history, "bench-user")
+    shutil.rmtree(os.path.dirname(pdf_path))
+
+
+def run(repeat=5, warmup=1):
+    """Time each stage over a range of input sizes and return one row per case."""
+    # Imported here so the caller can choose the model backend via the environment first
+    import main
+
+    rows = []
+
+    for n_words in TEXT_LENGTHS:
+        corpus = synthetic.text_corpus(repeat + warmup, n_words)
+        texts = iter(corpus * 2)
+        stats = time_call(lambda: main.analyze_text_sentiment(next(texts)), repeat, warmup)
+        rows.append({"stage": "analyze_text_sentiment", "input": f"{n_words} words", **stats})
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for seconds in AUDIO_SECONDS:
+            path = synthetic.write_audio_clip(os.path.join(temp_dir, f"clip_{seconds}s.wav"), seconds)
+            stats = time_call(lambda: main.extract_audio_features(path), repeat, warmup)
+            rows.append({"stage": "extract_audio_features", "input": f"{seconds}s audio", **stats})
+
+    for n_check_ins in HISTORY_SIZES:
+        history = synthetic.check_in_history(n_check_ins)
+        stats = time_call(lambda: _pdf_report(main, history), repeat, warmup)
+        rows.append({"stage": "generate_mood_summary_pdf", "input": f"{n_check_ins} check-ins", **stats})
+
+    return rows
@@ -0,0 +1,89 @@
+"""Peak-memory benchmark for streaming check-in ingestion.
+
+Request bodies are generated lazily in chunks, so the only memory that can
+grow with the history length is whatever the ingestion path itself keeps.
+Throughput is timed in a separate pass without tracemalloc, which would
+otherwise dominate the measurement.
+"""
+import asyncio
+import json
+import random
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from benchmarks import synthetic
+from checkin_stream import ingest_check_ins
+
+ROW_COUNTS = [10_000, 100_000, 1_000_000]
+CHUNK_BYTES = 64 * 1024
+# Distinct check-in bodies cycled through; only the timestamp changes per row
+TEMPLATE_ROWS = 1000
+
+
+def body_chunks(n_rows, fmt, seed=0):
+    """Yield an NDJSON or ``{"checkIns": [...]}`` body for ``n_rows`` check-ins."""
+    rng = random.Random(seed)
+    start = datetime(2020, 1, 1)
+    step = timedelta(minutes=10)
+
+    # Serialise a pool of check-ins once, leaving a slot for createdAt
+    templates = []
+    for _ in range(TEMPLATE_ROWS):
+        row = synthetic.check_in(start, rng)
+        del row["createdAt"]
+        templates.append(json.dumps(row)[:-1] + ', "createdAt": "')
+
+    parts = [] if fmt == "ndjson" else ['{"checkIns": [']
+    size = sum(len(p) for p in parts)
+    for i in range(n_rows):
+        created_at = (start + i * step).isoformat() + "Z"
+        row = templates[i % TEMPLATE_ROWS] + created_at + '"}'
+        if fmt == "ndjson":
+            row += "\n"
+        elif i:
+            row = "," + row
+        parts.append(row)
+        size += len(row)
+        if size >= CHUNK_BYTES:
+            yield "".join(parts).encode("utf-8")
+            parts, size = [], 0
+    if fmt == "json":
+        parts.append("]}")
+    if parts:
+        yield "".join(parts).encode("utf-8")
+
+
+async def _as_async(chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+def _ingest(n_rows, fmt):
+    return asyncio.run(ingest_check_ins(_as_async(body_chunks(n_rows, fmt)), f"application/{fmt}"))
+
+
+def measure(n_rows, fmt):
+    started = time.perf_counter()
+    summary = _ingest(n_rows, fmt)
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    _ingest(n_rows, fmt)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert summary.count == n_rows
+    return {
+        "format": fmt,
+        "rows": n_rows,
+        "peak_mib": peak / 2 ** 20,
+        "seconds": elapsed,
+        "rows_per_s": n_rows / elapsed,
+        "plot_points": len(summary.plot_points()[0]),
+    }
+
+
+def run(row_counts=None):
+    """Return one row per (format, history length); peak memory should stay flat."""
+    return [measure(n, fmt) for fmt in ("ndjson", "json") for n in row_counts or ROW_COUNTS]
@@ -0,0 +1,86 @@
+"""Synthetic inputs for the benchmarks: text, audio clips and check-in histories."""
+import random
+from datetime import datetime, timedelta
+
+import numpy as np
+import soundfile as sf
+
+POSITIVE_PHRASES = [
+    "I'm feeling great today", "had a lovely walk with friends", "work went really well",
+    "I slept well and feel rested", "looking forward to the weekend", "I feel calm and happy",
+]
+NEGATIVE_PHRASES = [
+    "I'm exhausted and can't focus", "everything feels overwhelming", "I'm worried about tomorrow",
+    "I had an argument and I'm still angry", "I feel lonely tonight", "I didn't sleep much",
+]
+NEUTRAL_PHRASES = [
+    "today was an ordinary day", "I had lunch and went back to work", "nothing much happened",
+    "I read for a while", "the weather was cloudy", "I cleaned the kitchen",
+]
+
+MOODS = ["happy", "sad", "anxious", "angry", "neutral", "tired", "energetic"]
+EMOTIONS = ["joy", "optimism", "neutral", "sadness", "anger", "fear", "surprise"]
+
+
+def text_sample(n_words, rng):
+    """Build a journal-like text of roughly ``n_words`` words."""
+    pools = [POSITIVE_PHRASES, NEGATIVE_PHRASES, NEUTRAL_PHRASES]
+    words = []
+    while len(words) < n_words:
+        words.extend(rng.choice(rng.choice(pools)).split())
+        words[-1] += "."
+    return " ".join(words[:n_words])
+
+
+def text_corpus(n_texts, n_words, seed=0):
+    """Return ``n_texts`` synthetic texts of ``n_words`` words each."""
+    rng = random.Random(seed)
+    return [text_sample(n_words, rng) for _ in range(n_texts)]
+
+
+def audio_clip(seconds, sr=16000, seed=0):
+    """Generate a speech-like signal: harmonic voiced segments with pauses and noise."""
+    rng = np.random.default_rng(seed)
+    n = int(seconds * sr)
+    t = np.arange(n) / sr
+
+    # Slowly wandering pitch around a typical speaking f0
+    f0 = 140 + 30 * np.sin(2 * np.pi * 0.3 * t + rng.uniform(0, np.pi))
+    phase = 2 * np.pi * np.cumsum(f0) / sr
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 6))
+
+    # Syllable-rate amplitude envelope (~4 Hz) with occasional pauses
+    envelope = np.clip(np.sin(2 * np.pi * 4 * t + rng.uniform(0, np.pi)), 0, None)
+    pauses = np.repeat(rng.random(int(np.ceil(seconds * 2))) > 0.2, sr // 2)[:n]
+    signal = 0.2 * voiced * envelope * pauses + 0.01 * rng.standard_normal(n)
+
+    return signal.astype(np.float32), sr
+
+
+def write_audio_clip(path, seconds, sr=16000, seed=0):
+    """Write a synthetic clip to ``path`` as WAV and return the path."""
+    signal, sr = audio_clip(seconds, sr=sr, seed=seed)
+    sf.write(path, signal, sr)
+    return path
+
+
+def check_in(created_at, rng):
+    """A single check-in shaped like the backend's ``/generate-summary`` payload."""
+    score = rng.randint(1, 10)
+    emotions = rng.sample(EMOTIONS, 2)
+    return {
+        "mood": rng.choice(MOODS),
+        "moodScore": score,
+        "energyLevel": rng.randint(1, 10),
+        "emotionalState": emotions[0],
+        "detectedEmotions": emotions,
+        "sentimentScore": round((score - 5) / 5, 3),
+        "createdAt": created_at.strftime("%Y-%m-%dT%H:%M:%SZ"),
+    }
+
+
+def check_in_history(n_check_ins, seed=0, start=None, step=timedelta(hours=8)):
+    """Return ``n_check_ins`` chronologically ordered synthetic check-ins."""
+    rng = random.Random(seed)
+    start = start or datetime(2024, 1, 1, 9, 0, 0)
+    return [check_in(start + i * step, rng) for i in range(n_check_ins)]
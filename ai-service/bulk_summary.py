@@ -0,0 +1,121 @@
+"""Weekly summaries for many users in one vectorized pass.
+
+Check-ins arrive as one columnar table (a column per field plus ``userId``),
+either in the request body or from a file under ``BULK_SUMMARY_DATA_DIR``.
+All per-user statistics come from a single pandas group-by; only the final
+text rendering runs per user.
+"""
+import os
+
+import pandas as pd
+
+from summary_text import build_summary_text
+
+REQUIRED_COLUMNS = ["userId", "mood", "moodScore", "energyLevel"]
+NUMERIC_COLUMNS = ["moodScore", "energyLevel"]
+
+
+def _coerce_numeric(df):
+    """Convert the score columns to numbers, rejecting values that are not."""
+    for name in NUMERIC_COLUMNS:
+        try:
+            df[name] = pd.to_numeric(df[name], errors="raise")
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Column {name} must be numeric: {e}") from e
+    return df
+
+
+def load_columnar(columns):
+    """Build a DataFrame from ``{"userId": [...], "moodScore": [...], ...}``."""
+    if not isinstance(columns, dict):
+        raise ValueError("checkIns must be an object of equal-length columns")
+    missing = [name for name in REQUIRED_COLUMNS if name not in columns]
+    if missing:
+        raise ValueError(f"Missing columns: {', '.join(missing)}")
+    not_lists = [name for name in REQUIRED_COLUMNS if not isinstance(columns[name], list)]
+    if not_lists:
+        raise ValueError(f"Columns must be arrays: {', '.join(not_lists)}")
+    lengths = {len(columns[name]) for name in REQUIRED_COLUMNS}
+    if len(lengths) != 1:
+        raise ValueError("All columns must have the same length")
+    return _coerce_numeric(pd.DataFrame({name: columns[name] for name in REQUIRED_COLUMNS}))
+
+
+def load_check_in_file(name, data_dir=None):
+    """Read a CSV, Parquet or NDJSON file of check-ins from the bulk data directory."""
+    if not isinstance(name, str):
+        raise ValueError("file must be a string")
+    data_dir = data_dir or os.getenv("BULK_SUMMARY_DATA_DIR")
+    if not data_dir:
+        raise ValueError("Reading check-ins from files is disabled (BULK_SUMMARY_DATA_DIR is not set)")
+
+    root = os.path.realpath(data_dir)
+    path = os.path.realpath(os.path.join(root, name))
+    if os.path.commonpath([root, path]) != root:
+        raise ValueError("File must be inside the bulk data directory")
+    if not os.path.isfile(path):
+        raise ValueError(f"File not found: {name}")
+
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        df = pd.read_csv(path, usecols=REQUIRED_COLUMNS)
+    elif extension == ".parquet":
+        df = pd.read_parquet(path, columns=REQUIRED_COLUMNS)
+    elif extension in (".ndjson", ".jsonl"):
+        df = pd.read_json(path, lines=True)
+        missing = [name for name in REQUIRED_COLUMNS if name not in df.columns]
+        if missing:
+            raise ValueError(f"Missing columns: {', '.join(missing)}")
+        df = df[REQUIRED_COLUMNS]
+    else:
+        raise ValueError("Unsupported file format")
+    return _coerce_numeric(df)
+
+
+def summarize_users(df):
+    """Per-user statistics, one row per user in order of first appearance.
+
+    Rows are taken to be chronological within each user, as the per-user
+    endpoint assumes for its trend.
+    """
+    df = df.assign(userId=df["userId"].astype(str))
+    grouped = df.groupby("userId", sort=False)
+    stats = grouped.agg(
+        check_ins=("moodScore", "size"),
+        avg_score=("moodScore", "mean"),
+        score_count=("moodScore", "count"),
+        avg_energy=("energyLevel", "mean"),
+        first_score=("moodScore", "first"),
+        last_score=("moodScore", "last"),
+    )
+    stats[["avg_score", "avg_energy"]] = stats[["avg_score", "avg_energy"]].fillna(0)
+
+    # Most frequent mood; ties go to the mood seen first, as in /generate-summary
+    mood_counts = (
+        df.dropna(subset=["mood"])
+        .groupby(["userId", "mood"], sort=False)
+        .size()
+        .reset_index(name="n")
+        .sort_values("n", ascending=False, kind="stable")
+        .drop_duplicates("userId")
+        .set_index("userId")["mood"]
+    )
+    stats["most_common_mood"] = mood_counts.reindex(stats.index).fillna("neutral")
+    return stats
+
+
+def render_summaries(stats):
+    """Insight and recommendation text for every row of :func:`summarize_users`."""
+    summaries = []
+    for row in stats.itertuples():
+        insights, recommendations = build_summary_text(
+            row.avg_score, row.avg_energy, row.most_common_mood,
+            row.score_count, row.first_score, row.last_score,
+        )
+        summaries.append({
+            "userId": row.Index,
+            "checkIns": int(row.check_ins),
+            "insights": insights,
+            "recommendations": recommendations,
+        })
+    return summaries
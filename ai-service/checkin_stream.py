@@ -0,0 +1,287 @@
+"""Streaming ingestion of check-in histories.
+
+``/generate-summary`` and ``/generate-pdf-report`` accept either NDJSON (one
+check-in per line, ``Content-Type: application/x-ndjson``) or the original
+``{"checkIns": [...]}`` JSON body. Both are parsed incrementally from the
+request stream and folded into a :class:`CheckInAggregator`, so memory use
+does not grow with the length of the history.
+"""
+import codecs
+import json
+import re
+from datetime import datetime, timezone
+
+import pandas as pd
+from fastapi import HTTPException
+
+# Upper bound on points kept for the report charts
+MAX_PLOT_POINTS = 512
+
+# Longest single check-in (or NDJSON line) held while waiting for the rest of
+# it; beyond this the element is treated as malformed instead of buffering on
+MAX_PENDING_CHARS = 1 << 20
+
+_CHECK_INS_KEY = re.compile(r'"checkIns"\s*:\s*\[')
+
+
+def parse_timestamp(value):
+    """Parse an ISO timestamp (``Z`` suffix allowed) into an aware UTC datetime."""
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (AttributeError, ValueError):
+        parsed = pd.Timestamp(value).to_pydatetime()
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+class CheckInAggregator:
+    """Running statistics and a bounded chart buffer over a stream of check-ins.
+
+    The chart buffer holds at most ``max_points`` buckets. When it fills up,
+    adjacent buckets are merged and each new bucket covers twice as many
+    check-ins, so short histories are plotted point for point and long ones
+    as evenly spaced averages.
+    """
+
+    def __init__(self, max_points=MAX_PLOT_POINTS):
+        self.max_points = max_points
+        self.count = 0
+        self.score_sum = 0.0
+        self.score_count = 0
+        self.energy_sum = 0.0
+        self.energy_count = 0
+        self.first_score = None
+        self.last_score = None
+        self.mood_counts = {}
+        self.start = None
+        self.end = None
+
+        # Each bucket is [time_sum, time_n, score_sum, score_n, energy_sum, energy_n]
+        self._buckets = []
+        self._bucket_size = 1
+        self._current = None
+        self._current_rows = 0
+
+    def add(self, check_in):
+        self.count += 1
+
+        mood = check_in.get("mood")
+        if mood:
+            self.mood_counts[mood] = self.mood_counts.get(mood, 0) + 1
+
+        score = check_in.get("moodScore")
+        if score is not None:
+            self.score_sum += score
+            self.score_count += 1
+            if self.first_score is None:
+                self.first_score = score
+            self.last_score = score
+
+        energy = check_in.get("energyLevel")
+        if energy is not None:
+            self.energy_sum += energy
+            self.energy_count += 1
+
+        created_at = check_in.get("createdAt")
+        if created_at is None:
+            return
+        date = parse_timestamp(created_at)
+        if self.start is None or date < self.start:
+            self.start = date
+        if self.end is None or date > self.end:
+            self.end = date
+
+        self._add_point(date.timestamp(), score, energy)
+
+    def extend(self, check_ins):
+        for check_in in check_ins:
+            self.add(check_in)
+        return self
+
+    def _add_point(self, timestamp, score, energy):
+        if self._current is None:
+            self._current = [0.0, 0, 0.0, 0, 0.0, 0]
+        bucket = self._current
+        bucket[0] += timestamp
+        bucket[1] += 1
+        if score is not None:
+            bucket[2] += score
+            bucket[3] += 1
+        if energy is not None:
+            bucket[4] += energy
+            bucket[5] += 1
+
+        self._current_rows += 1
+        if self._current_rows < self._bucket_size:
+            return
+
+        self._buckets.append(bucket)
+        self._current = None
+        self._current_rows = 0
+        if len(self._buckets) >= self.max_points:
+            self._buckets = [
+                [a + b for a, b in zip(self._buckets[i], self._buckets[i + 1])]
+                for i in range(0, len(self._buckets) - 1, 2)
+            ]
+            self._bucket_size *= 2
+
+    @property
+    def avg_score(self):
+        return self.score_sum / self.score_count if self.score_count else 0
+
+    @property
+    def avg_energy(self):
+        return self.energy_sum / self.energy_count if self.energy_count else 0
+
+    @property
+    def most_common_mood(self):
+        return max(self.mood_counts.items(), key=lambda x: x[1])[0] if self.mood_counts else None
+
+    def plot_points(self):
+        """Return ``(dates, scores, energies)`` for the chart; missing values are NaN."""
+        buckets = self._buckets + ([self._current] if self._current else [])
+        dates, scores, energies = [], [], []
+        for time_sum, time_n, score_sum, score_n, energy_sum, energy_n in buckets:
+            dates.append(datetime.fromtimestamp(time_sum / time_n, tz=timezone.utc))
+            scores.append(score_sum / score_n if score_n else float("nan"))
+            energies.append(energy_sum / energy_n if energy_n else float("nan"))
+        return dates, scores, energies
+
+
+class NDJSONParser:
+    """Incremental parser for newline-delimited JSON objects."""
+
+    def __init__(self, max_pending=MAX_PENDING_CHARS):
+        self.max_pending = max_pending
+        self._buffer = ""
+
+    def feed(self, text):
+        self._buffer += text
+        *lines, self._buffer = self._buffer.split("\n")
+        if len(self._buffer) > self.max_pending:
+            raise ValueError(f"NDJSON line longer than {self.max_pending} characters")
+        return [json.loads(line) for line in lines if line.strip()]
+
+    def close(self):
+        tail, self._buffer = self._buffer, ""
+        return [json.loads(tail)] if tail.strip() else []
+
+
+class JSONArrayParser:
+    """Incremental parser yielding the elements of a JSON check-in array.
+
+    Accepts a top-level array or an object with a ``checkIns`` array; other
+    keys in the object are skipped without being parsed. Up to
+    ``max_pending`` characters of text skipped before the array are kept, so
+    a body without one can still be checked for being valid JSON when the
+    stream ends. An element that is still incomplete after ``max_pending``
+    characters is rejected, so a malformed element cannot make the parser
+    buffer the rest of the body.
+    """
+
+    def __init__(self, max_pending=MAX_PENDING_CHARS):
+        self.max_pending = max_pending
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._skipped = []
+        self._skipped_chars = 0
+        self._started = False
+        self._in_array = False
+        self._done = False
+
+    def feed(self, text):
+        self._buffer += text
+        if self._done:
+            self._buffer = ""
+            return []
+
+        if not self._in_array and not self._find_array():
+            return []
+
+        items = []
+        pos = 0
+        buffer = self._buffer
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos == len(buffer):
+                break
+            if buffer[pos] == "]":
+                self._done = True
+                pos = len(buffer)
+                break
+            try:
+                item, pos = self._decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # Element is split across chunks; wait for the rest
+                break
+            items.append(item)
+
+        self._buffer = buffer[pos:]
+        if len(self._buffer) > self.max_pending:
+            raise ValueError(f"Check-in element is malformed or longer than {self.max_pending} characters")
+        return items
+
+    def _find_array(self):
+        if not self._started:
+            stripped = self._buffer.lstrip()
+            if not stripped:
+                return False
+            self._started = True
+            if stripped[0] == "[":
+                self._buffer = stripped[1:]
+                self._in_array = True
+                return True
+
+        match = _CHECK_INS_KEY.search(self._buffer)
+        if not match:
+            # Keep enough of the tail to catch a key split across chunks
+            if self._skipped is not None:
+                self._skipped.append(self._buffer[:-64])
+                self._skipped_chars += len(self._skipped[-1])
+                if self._skipped_chars > self.max_pending:
+                    # Too long to validate later; stop keeping it
+                    self._skipped = None
+            self._buffer = self._buffer[-64:]
+            return False
+        self._buffer = self._buffer[match.end():]
+        self._skipped = []
+        self._in_array = True
+        return True
+
+    def close(self):
+        if self._in_array and not self._done:
+            raise ValueError("Check-in array is truncated or malformed")
+        if self._started and not self._in_array:
+            if self._skipped is None:
+                raise ValueError("No check-in array found in the body")
+            body = "".join(self._skipped) + self._buffer
+            self._skipped, self._buffer = [], ""
+            try:
+                json.loads(body)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Body is not valid JSON: {e}")
+        return []
+
+
+async def ingest_check_ins(chunks, content_type, aggregator=None):
+    """Fold check-ins from an async iterable of byte chunks into an aggregator."""
+    aggregator = aggregator or CheckInAggregator()
+    is_ndjson = "ndjson" in content_type or "jsonl" in content_type
+    parser = NDJSONParser() if is_ndjson else JSONArrayParser()
+    decoder = codecs.getincrementaldecoder("utf-8")()
+
+    async for chunk in chunks:
+        aggregator.extend(parser.feed(decoder.decode(chunk)))
+    aggregator.extend(parser.feed(decoder.decode(b"", final=True)))
+    aggregator.extend(parser.close())
+    return aggregator
+
+
+async def read_check_ins(request):
+    """Stream the request body into a :class:`CheckInAggregator`."""
+    try:
+        return await ingest_check_ins(request.stream(), request.headers.get("content-type", ""))
+    except (ValueError, AttributeError, TypeError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid check-in data: {str(e)}")
@@ -0,0 +1,224 @@
+"""Fusion of text and acoustic signals into one mood distribution.
+
+Inputs are the text classifiers' probabilities (sentiment plus emotions) and
+the acoustic feature vector from ``extract_audio_features``. Both models
+score whole batches with a few numpy operations:
+
+* ``LinearFusion``: a softmax regression over the standardized, concatenated
+  features with a fitted temperature, trained by ``fit_linear_fusion`` and
+  loaded from ``FUSION_MODEL_PATH`` (default ``models/fusion.npz``).
+* ``PriorFusion``: the fallback when no trained weights exist. It maps the
+  text probabilities onto moods, softens the voice rules of
+  ``analyze_voice_features`` into probabilities, and combines the two as a
+  weighted product of experts. Its weights and temperature are hand-set,
+  so the output ranks moods but is not a calibrated distribution.
+
+Both take an optional ``has_text`` mask for clips without a transcript; the
+prior then uses the voice expert alone rather than the uninformative text
+vector, which its mood mapping does not treat as neutral.
+"""
+import os
+
+import numpy as np
+
+MOODS = ["happy", "neutral", "sad", "anxious", "angry", "tired"]
+SENTIMENT_LABELS = ["NEGATIVE", "POSITIVE"]
+EMOTION_LABELS = ["anger", "disgust", "fear", "joy", "neutral", "sadness", "surprise"]
+
+TEXT_DIM = len(SENTIMENT_LABELS) + len(EMOTION_LABELS)
+# mfcc_mean (13), centroid_mean, contrast_mean (7), zcr_mean, rms_mean, tempo
+ACOUSTIC_DIM = 24
+CENTROID, ZCR, RMS, TEMPO = 13, 21, 22, 23
+
+DEFAULT_MODEL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models", "fusion.npz")
+
+# How strongly each text feature points at each mood (rows follow the text vector)
+_TEXT_TO_MOOD = np.array([
+    # happy neutral sad  anxious angry tired
+    [0.0,  0.1,   0.4,  0.2,    0.2,  0.1],  # NEGATIVE
+    [0.8,  0.2,   0.0,  0.0,    0.0,  0.0],  # POSITIVE
+    [0.0,  0.0,   0.0,  0.1,    0.9,  0.0],  # anger
+    [0.0,  0.0,   0.3,  0.0,    0.7,  0.0],  # disgust
+    [0.0,  0.0,   0.1,  0.9,    0.0,  0.0],  # fear
+    [0.9,  0.1,   0.0,  0.0,    0.0,  0.0],  # joy
+    [0.0,  0.9,   0.0,  0.0,    0.0,  0.1],  # neutral
+    [0.0,  0.0,   0.8,  0.0,    0.0,  0.2],  # sadness
+    [0.5,  0.1,   0.0,  0.4,    0.0,  0.0],  # surprise
+])
+
+
+def text_feature_vector(analysis=None):
+    """Text probabilities from an ``analyze_text_sentiment`` result.
+
+    The emotion pipeline only returns its top labels, so the remaining
+    probability mass is spread evenly over the others. Without an analysis
+    (no transcript) the vector is uninformative.
+    """
+    if not analysis:
+        return np.concatenate([np.full(2, 0.5), np.full(len(EMOTION_LABELS), 1 / len(EMOTION_LABELS))])
+
+    signed = analysis["sentimentScore"]
+    positive = signed if signed >= 0 else 1 + signed
+
+    scores = analysis.get("emotion_scores", {})
+    known = [scores.get(label) for label in EMOTION_LABELS]
+    missing = sum(score is None for score in known)
+    rest = max(0.0, 1 - sum(score for score in known if score is not None)) / missing if missing else 0.0
+    emotions = [rest if score is None else score for score in known]
+
+    return np.array([1 - positive, positive] + emotions, dtype=float)
+
+
+def acoustic_feature_vector(features):
+    """Flatten an ``extract_audio_features`` dict into a fixed-order vector."""
+    return np.array(
+        list(features["mfcc_mean"])
+        + [features["centroid_mean"]]
+        + list(features["contrast_mean"])
+        + [features["zcr_mean"], features["rms_mean"], features["tempo"]],
+        dtype=float,
+    )
+
+
+def _softmax(logits):
+    logits = logits - logits.max(axis=1, keepdims=True)
+    exp = np.exp(logits)
+    return exp / exp.sum(axis=1, keepdims=True)
+
+
+def _sigmoid(x):
+    return 1 / (1 + np.exp(-x))
+
+
+def _normalize(p):
+    return p / p.sum(axis=1, keepdims=True)
+
+
+class PriorFusion:
+    """Product of a text-derived and a voice-derived mood distribution (uncalibrated)."""
+
+    def __init__(self, text_weight=0.7, voice_weight=0.3, temperature=1.0):
+        self.text_weight = text_weight
+        self.voice_weight = voice_weight
+        self.temperature = temperature
+
+    def text_distribution(self, text_features):
+        sentiment = text_features[:, :2] @ _TEXT_TO_MOOD[:2]
+        emotions = text_features[:, 2:] @ _TEXT_TO_MOOD[2:]
+        return _normalize(0.5 * sentiment + 0.5 * emotions + 1e-3)
+
+    def voice_distribution(self, acoustic_features):
+        """Soft version of the thresholds in ``analyze_voice_features``."""
+        rms = acoustic_features[:, RMS]
+        tempo = acoustic_features[:, TEMPO]
+        zcr = acoustic_features[:, ZCR]
+        centroid = acoustic_features[:, CENTROID]
+
+        loud_and_fast = _sigmoid((rms - 0.1) / 0.02) * _sigmoid((tempo - 120) / 10)
+        quiet = _sigmoid((0.05 - rms) / 0.01) * (1 - loud_and_fast)
+        slow = _sigmoid((100 - tempo) / 10) * (1 - loud_and_fast) * (1 - quiet)
+        low_zcr = _sigmoid((0.1 - zcr) / 0.02)
+        low_centroid = _sigmoid((2000 - centroid) / 200)
+        low_rms = _sigmoid((0.08 - rms) / 0.01)
+
+        happy = loud_and_fast * low_zcr
+        anxious = loud_and_fast * (1 - low_zcr)
+        sad = quiet * (1 - low_centroid)
+        tired = slow * low_rms
+        neutral = 1 - happy - anxious - sad - tired
+        angry = np.zeros_like(rms)
+
+        voice = np.stack([happy, neutral, sad, anxious, angry, tired], axis=1)
+        return _normalize(np.clip(voice, 0, None) + 0.05)
+
+    def predict_proba(self, text_features, acoustic_features, has_text=True):
+        text_features = np.atleast_2d(text_features)
+        acoustic_features = np.atleast_2d(acoustic_features)
+        # Rows without a transcript are scored by the voice expert alone
+        has_text = np.broadcast_to(has_text, (len(acoustic_features),))[:, None]
+        text_weight = np.where(has_text, self.text_weight, 0.0)
+        voice_weight = np.where(has_text, self.voice_weight, 1.0)
+        log_p = (
+            text_weight * np.log(self.text_distribution(text_features))
+            + voice_weight * np.log(self.voice_distribution(acoustic_features))
+        )
+        return _softmax(log_p / self.temperature)
+
+
+class LinearFusion:
+    """Temperature-scaled softmax regression over text and acoustic features."""
+
+    def __init__(self, weights, bias, mean, scale, temperature=1.0):
+        self.weights = weights
+        self.bias = bias
+        self.mean = mean
+        self.scale = scale
+        self.temperature = temperature
+
+    def logits(self, text_features, acoustic_features):
+        x = np.hstack([np.atleast_2d(text_features), np.atleast_2d(acoustic_features)])
+        return ((x - self.mean) / self.scale) @ self.weights + self.bias
+
+    def predict_proba(self, text_features, acoustic_features, has_text=True):
+        # The uninformative text vector is an input the model was fitted on,
+        # so clips without a transcript need no special handling
+        return _softmax(self.logits(text_features, acoustic_features) / self.temperature)
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        np.savez(
+            path, weights=self.weights, bias=self.bias, mean=self.mean, scale=self.scale,
+            temperature=self.temperature, moods=np.array(MOODS),
+        )
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(path)
+        if list(data["moods"]) != MOODS:
+            raise ValueError(f"Fusion model at {path} was trained for different moods")
+        return cls(data["weights"], data["bias"], data["mean"], data["scale"], float(data["temperature"]))
+
+
+def fit_temperature(logits, labels, candidates=np.linspace(0.25, 4.0, 76)):
+    """Temperature minimising negative log-likelihood on held-out data."""
+    rows = np.arange(len(labels))
+    nll = [-np.log(_softmax(logits / t)[rows, labels] + 1e-12).mean() for t in candidates]
+    return float(candidates[int(np.argmin(nll))])
+
+
+def fit_linear_fusion(text_features, acoustic_features, labels, val_fraction=0.2, seed=0):
+    """Train a ``LinearFusion`` on mood indices ``labels``, calibrating on a held-out split."""
+    from sklearn.linear_model import LogisticRegression
+
+    x = np.hstack([text_features, acoustic_features])
+    labels = np.asarray(labels)
+    order = np.random.default_rng(seed).permutation(len(labels))
+    n_val = max(1, int(len(labels) * val_fraction))
+    val, train = order[:n_val], order[n_val:]
+
+    mean = x[train].mean(axis=0)
+    scale = x[train].std(axis=0) + 1e-6
+    classifier = LogisticRegression(C=1.0, max_iter=1000)
+    classifier.fit((x[train] - mean) / scale, labels[train])
+
+    # Moods absent from the training data get a bias that keeps them near zero
+    weights = np.zeros((x.shape[1], len(MOODS)))
+    bias = np.full(len(MOODS), -20.0)
+    coef, intercept = classifier.coef_, classifier.intercept_
+    if len(classifier.classes_) == 2:
+        coef = np.vstack([-coef[0] / 2, coef[0] / 2])
+        intercept = np.array([-intercept[0] / 2, intercept[0] / 2])
+    weights[:, classifier.classes_] = coef.T
+    bias[classifier.classes_] = intercept
+
+    model = LinearFusion(weights, bias, mean, scale)
+    model.temperature = fit_temperature(model.logits(x[val, :TEXT_DIM], x[val, TEXT_DIM:]), labels[val])
+    return model
+
+
+def load_fusion_model(path=None):
+    """The trained model at ``path`` if it exists, otherwise the prior fusion."""
+    path = path or os.getenv("FUSION_MODEL_PATH", DEFAULT_MODEL_PATH)
+    if os.path.exists(path):
+        return LinearFusion.load(path)
+    return PriorFusion()
@@ -1,4 +1,6 @@
 import os
+import secrets
+import shutil
 import tempfile
 import json
 import torch
@@ -16,12 +18,19 @@ from dotenv import load_dotenv
 import jwt
 from datetime import datetime, timedelta
 import pytz
-import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 from fpdf import FPDF
 import logging
+import threading
 from io import BytesIO
+from fastapi.concurrency import run_in_threadpool
+from starlette.background import BackgroundTask
+from admission import controller_from_env, count_text_tokens, estimate_audio_seconds
+from checkin_stream import CheckInAggregator, read_check_ins
+from summary_text import build_report_text, build_summary_text
+from fusion import MOODS as FUSION_MOODS, acoustic_feature_vector, load_fusion_model, text_feature_vector
+from bulk_summary import load_check_in_file, load_columnar, render_summaries, summarize_users
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -41,21 +50,43 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Opt-in per-endpoint memory, file descriptor and temp file tracking (see /debug/profile)
+if os.getenv("AI_SERVICE_PROFILING") == "1":
+    from profiling import install as install_profiling
+    profiler = install_profiling(app)
+else:
+    profiler = None
+
 # JWT Authentication settings
 JWT_SECRET = os.getenv("JWT_SECRET", "your-secret-key")
 JWT_ALGORITHM = "HS256"
 
-# Initialize sentiment analysis pipeline
-sentiment_model = "distilbert-base-uncased-finetuned-sst-2-english"
-sentiment_pipeline = pipeline("sentiment-analysis", model=sentiment_model)
+# Per-user rate limits and priority scheduling, configured from ADMISSION_* variables
+admission_controller = controller_from_env()
 
-# Initialize emotion detection pipeline
-emotion_model = "j-hartmann/emotion-english-distilroberta-base"
-emotion_pipeline = pipeline("text-classification", model=emotion_model, top_k=3)
+# pyplot keeps global state, so reports rendered from worker threads take turns
+plot_lock = threading.Lock()
 
-# Initialize speech recognition pipeline
+sentiment_model = "distilbert-base-uncased-finetuned-sst-2-english"
+emotion_model = "j-hartmann/emotion-english-distilroberta-base"
 speech_model = "openai/whisper-small"
-speech_pipeline = pipeline("automatic-speech-recognition", model=speech_model)
+
+# Set AI_SERVICE_TINY_MODELS=1 to run offline with small randomly initialised models
+if os.getenv("AI_SERVICE_TINY_MODELS") == "1":
+    from tiny_models import build_tiny_pipelines
+    sentiment_pipeline, emotion_pipeline, speech_pipeline = build_tiny_pipelines()
+else:
+    # Initialize sentiment analysis pipeline
+    sentiment_pipeline = pipeline("sentiment-analysis", model=sentiment_model)
+
+    # Initialize emotion detection pipeline
+    emotion_pipeline = pipeline("text-classification", model=emotion_model, top_k=3)
+
+    # Initialize speech recognition pipeline
+    speech_pipeline = pipeline("automatic-speech-recognition", model=speech_model)
+
+# Combines text probabilities and acoustic features in analyze_voice
+fusion_model = load_fusion_model()
 
 # Load recommendation data
 RECOMMENDATION_DATA = {
@@ -229,6 +260,15 @@ def extract_audio_features(file_path):
     
     return features
 
+def prepare_audio(audio_path, file_extension):
+    """Return a path librosa can read, converting WebM uploads to WAV."""
+    if file_extension != ".webm":
+        return audio_path
+    wav_path = os.path.splitext(audio_path)[0] + ".wav"
+    audio_segment = AudioSegment.from_file(audio_path, format="webm")
+    audio_segment.export(wav_path, format="wav")
+    return wav_path
+
 def analyze_voice_features(features):
     """Analyze voice features to determine emotional state."""
     # This is a simplified rule-based approach
@@ -286,6 +326,7 @@ def analyze_text_sentiment(text):
     # Get emotions
     emotions_result = emotion_pipeline(text)
     detected_emotions = [item["label"] for item in emotions_result]
+    emotion_scores = {item["label"]: item["score"] for item in emotions_result}
     
     # Map sentiment to mood
     if normalized_score > 0.6:
@@ -325,7 +366,8 @@ def analyze_text_sentiment(text):
         "energy": energy_level,
         "sentimentScore": normalized_score,
         "emotional_state": detected_emotions[0] if detected_emotions else "neutral",
-        "detected_emotions": detected_emotions
+        "detected_emotions": detected_emotions,
+        "emotion_scores": emotion_scores
     }
 
 def get_recommendations(mood, energy_level, detected_emotions=[]):
@@ -457,42 +499,53 @@ def get_game_recommendations(mood, energy_level):
     
     return recommended_games
 
+def pdf_text(text):
+    """Map text onto the WinAnsi encoding used by the PDF core fonts (keeps bullets)."""
+    return text.encode("cp1252", "replace").decode("latin-1")
+
 def generate_mood_summary_pdf(check_ins, user_id):
-    """Generate a PDF report of mood check-ins."""
+    """Generate a PDF report of mood check-ins.
+
+    ``check_ins`` may be a list of check-ins or an already filled CheckInAggregator.
+    """
+    # Create temporary directory for files; the caller removes it once the PDF is sent
+    temp_dir = tempfile.mkdtemp()
     try:
-        # Create a DataFrame from check-ins
-        df = pd.DataFrame(check_ins)
-        df['date'] = pd.to_datetime(df['createdAt'])
-        
-        # Create temporary directory for files
-        temp_dir = tempfile.mkdtemp()
-        
-        # Create plots
-        plt.figure(figsize=(10, 6))
-        
-        # Mood score over time
-        plt.subplot(2, 1, 1)
-        plt.plot(df['date'], df['moodScore'], marker='o', linestyle='-', color='#4B9CD3')
-        plt.title('Mood Score Over Time')
-        plt.ylabel('Mood Score')
-        plt.ylim(0, 10)
-        plt.grid(True, linestyle='--', alpha=0.7)
-        
-        # Energy level over time
-        plt.subplot(2, 1, 2)
-        plt.plot(df['date'], df['energyLevel'], marker='o', linestyle='-', color='#F26522')
-        plt.title('Energy Level Over Time')
-        plt.xlabel('Date')
-        plt.ylabel('Energy Level')
-        plt.ylim(0, 10)
-        plt.grid(True, linestyle='--', alpha=0.7)
-        
-        plt.tight_layout()
-        
-        # Save plot to file
+        # Fold check-ins into running statistics and chart points
+        if isinstance(check_ins, CheckInAggregator):
+            summary = check_ins
+        else:
+            summary = CheckInAggregator().extend(check_ins)
+        dates, scores, energy_levels = summary.plot_points()
+        
         plot_path = os.path.join(temp_dir, f"mood_chart_{user_id}.png")
-        plt.savefig(plot_path)
-        plt.close()
+        with plot_lock:
+            # Create plots
+            fig = plt.figure(figsize=(10, 6))
+            try:
+                # Mood score over time
+                plt.subplot(2, 1, 1)
+                plt.plot(dates, scores, marker='o', linestyle='-', color='#4B9CD3')
+                plt.title('Mood Score Over Time')
+                plt.ylabel('Mood Score')
+                plt.ylim(0, 10)
+                plt.grid(True, linestyle='--', alpha=0.7)
+            
+                # Energy level over time
+                plt.subplot(2, 1, 2)
+                plt.plot(dates, energy_levels, marker='o', linestyle='-', color='#F26522')
+                plt.title('Energy Level Over Time')
+                plt.xlabel('Date')
+                plt.ylabel('Energy Level')
+                plt.ylim(0, 10)
+                plt.grid(True, linestyle='--', alpha=0.7)
+            
+                plt.tight_layout()
+            
+                # Save plot to file
+                plt.savefig(plot_path)
+            finally:
+                plt.close(fig)
         
         # Create a PDF
         pdf = FPDF()
@@ -505,21 +558,19 @@ def generate_mood_summary_pdf(check_ins, user_id):
         
         # Date range
         pdf.set_font('Arial', '', 12)
-        date_range = f"Report period: {df['date'].min().strftime('%Y-%m-%d')} to {df['date'].max().strftime('%Y-%m-%d')}"
+        date_range = f"Report period: {summary.start.strftime('%Y-%m-%d')} to {summary.end.strftime('%Y-%m-%d')}"
         pdf.cell(0, 10, date_range, 0, 1)
         pdf.ln(5)
         
-        # Statistics
+        # Statistics and recommendation text share the summary rule set
+        statistics, recommendations = build_report_text(
+            summary.avg_score, summary.avg_energy, summary.most_common_mood or "N/A"
+        )
         pdf.set_font('Arial', 'B', 14)
         pdf.cell(0, 10, 'Summary Statistics:', 0, 1)
         pdf.set_font('Arial', '', 12)
-        pdf.cell(0, 10, f"Average Mood Score: {df['moodScore'].mean():.1f}/10", 0, 1)
-        pdf.cell(0, 10, f"Average Energy Level: {df['energyLevel'].mean():.1f}/10", 0, 1)
-        
-        # Most frequent mood
-        mood_counts = df['mood'].value_counts()
-        most_common = mood_counts.index[0] if not mood_counts.empty else "N/A"
-        pdf.cell(0, 10, f"Most Common Mood: {most_common}", 0, 1)
+        for line in statistics:
+            pdf.cell(0, 10, pdf_text(line), 0, 1)
         pdf.ln(10)
         
         # Add chart
@@ -532,21 +583,17 @@ def generate_mood_summary_pdf(check_ins, user_id):
         pdf.set_font('Arial', 'B', 14)
         pdf.cell(0, 10, 'Recommendations:', 0, 1)
         pdf.set_font('Arial', '', 12)
-        
-        if df['moodScore'].mean() < 4:
-            pdf.multi_cell(0, 10, '• Consider speaking with a mental health professional\n• Prioritize self-care and rest\n• Try daily mood-boosting activities')
-        elif df['moodScore'].mean() < 7:
-            pdf.multi_cell(0, 10, '• Maintain healthy habits\n• Incorporate mindfulness practices\n• Stay connected with supportive people')
-        else:
-            pdf.multi_cell(0, 10, '• Great job maintaining positive mental health\n• Continue your current wellness practices\n• Share your strategies with others who might benefit')
+        pdf.multi_cell(0, 10, pdf_text(recommendations))
         
         # Save the PDF to a temporary file
         pdf_path = os.path.join(temp_dir, f"mood_summary_{user_id}.pdf")
         pdf.output(pdf_path)
+        os.remove(plot_path)
         
         return pdf_path
         
     except Exception as e:
+        shutil.rmtree(temp_dir, ignore_errors=True)
         logger.error(f"Error generating PDF: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error generating PDF: {str(e)}")
 
@@ -571,12 +618,12 @@ def verify_token(authorization: str = Header(None)):
 
 
 @app.post("/analyze-voice")
-async def analyze_voice(audio: UploadFile = File(...), user_id: str = Depends(verify_token)):
+async def analyze_voice(audio: UploadFile = File(...), transcript: Optional[str] = Form(None), user_id: str = Depends(verify_token)):
     """Analyze voice recording to detect mood and emotions."""
+    temp_dir = tempfile.mkdtemp()
     try:
         logger.info(f"Analyzing voice for user {user_id}")
         # Save the uploaded file temporarily
-        temp_dir = tempfile.mkdtemp()
         temp_audio_path = os.path.join(temp_dir, "audio_file")
         
         with open(temp_audio_path, "wb") as buffer:
@@ -584,44 +631,73 @@ async def analyze_voice(audio: UploadFile = File(...), user_id: str = Depends(ve
                 buffer.write(chunk)
 
         
-        # Convert WebM to WAV for processing if needed
         file_extension = os.path.splitext(audio.filename)[1].lower()
-        processed_audio_path = temp_audio_path
-        
         if file_extension not in [".webm", ".wav", ".mp3"]:
             raise HTTPException(status_code=400, detail="Unsupported file format")
-
-
-        if file_extension == ".webm":
-            wav_path = os.path.join(temp_dir, "audio_file.wav")
-            audio_segment = AudioSegment.from_file(temp_audio_path, format="webm")
-            audio_segment.export(wav_path, format="wav")
-            processed_audio_path = wav_path
         
-        # Transcribe audio to text
-        transcription = speech_pipeline(processed_audio_path)
-        transcribed_text = transcription["text"]
-        
-        # Extract audio features
-        audio_features = extract_audio_features(processed_audio_path)
-        
-        # Analyze voice features
-        voice_analysis = analyze_voice_features(audio_features)
+        # Cost the request from the upload size, so a rate-limited user never gets a decode
+        duration = estimate_audio_seconds(os.path.getsize(temp_audio_path), file_extension)
+        
+        async with admission_controller.admit(user_id, "/analyze-voice", units=duration):
+            # Convert WebM to WAV for processing if needed, off the event loop
+            processed_audio_path = await run_in_threadpool(prepare_audio, temp_audio_path, file_extension)
+            
+            # Transcribe audio to text, unless the ASR queue is saturated
+            with admission_controller.asr_slot() as asr_available:
+                if asr_available:
+                    transcription = await run_in_threadpool(speech_pipeline, processed_audio_path)
+                    transcribed_text = transcription["text"]
+                else:
+                    # Degrade to the client's own transcript, if it sent one
+                    transcribed_text = transcript or ""
+            
+            # Extract audio features
+            audio_features = await run_in_threadpool(extract_audio_features, processed_audio_path)
+            
+            # Analyze voice features
+            voice_analysis = analyze_voice_features(audio_features)
+            
+            # Analyze text sentiment
+            if transcribed_text:
+                text_analysis = await run_in_threadpool(analyze_text_sentiment, transcribed_text)
+            else:
+                text_analysis = None
         
-        # Analyze text sentiment
-        text_analysis = analyze_text_sentiment(transcribed_text)
+        # Fuse text probabilities and acoustic features into one mood distribution
+        mood_distribution = fusion_model.predict_proba(
+            text_feature_vector(text_analysis), acoustic_feature_vector(audio_features),
+            has_text=text_analysis is not None,
+        )[0]
+        fused_mood = FUSION_MOODS[int(mood_distribution.argmax())]
         
         # Combine analyses
-        combined_analysis = {
-            "mood": text_analysis["mood"],
-            "score": text_analysis["score"],
-            "energy": (text_analysis["energy"] + voice_analysis["energy"]) // 2,
-            "sentimentScore": text_analysis["sentimentScore"],
-            "emotional_state": text_analysis["emotional_state"],
-            "detected_emotions": text_analysis["detected_emotions"],
-            "transcribed_text": transcribed_text,
-            "user_id": user_id
-        }
+        if text_analysis:
+            combined_analysis = {
+                "mood": fused_mood,
+                "score": text_analysis["score"],
+                "energy": (text_analysis["energy"] + voice_analysis["energy"]) // 2,
+                "sentimentScore": text_analysis["sentimentScore"],
+                "emotional_state": text_analysis["emotional_state"],
+                "detected_emotions": text_analysis["detected_emotions"],
+                "text_analyzed": True,
+            }
+        else:
+            # Acoustic-only analysis when there is no transcript to work with.
+            # Score and sentiment are neutral placeholders (check-ins require
+            # numbers); text_analyzed tells clients they were not measured.
+            combined_analysis = {
+                "mood": fused_mood,
+                "score": 5,
+                "energy": voice_analysis["energy"],
+                "sentimentScore": 0.0,
+                "emotional_state": voice_analysis["emotional_state"],
+                "detected_emotions": [voice_analysis["emotional_state"]],
+                "text_analyzed": False,
+            }
+        combined_analysis["mood_distribution"] = dict(zip(FUSION_MOODS, mood_distribution.round(4).tolist()))
+        combined_analysis["transcribed_text"] = transcribed_text
+        combined_analysis["degraded"] = not asr_available
+        combined_analysis["user_id"] = user_id
         
         # Generate game recommendations based on emotional state
         game_recommendations = get_game_recommendations(combined_analysis["mood"], combined_analysis["energy"])
@@ -629,9 +705,13 @@ async def analyze_voice(audio: UploadFile = File(...), user_id: str = Depends(ve
         
         return combined_analysis
     
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error analyzing voice: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error analyzing voice: {str(e)}")
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
 
 @app.post("/analyze-text")
 async def analyze_text(request: Request, user_id: str = Depends(verify_token)):
@@ -643,10 +723,13 @@ async def analyze_text(request: Request, user_id: str = Depends(verify_token)):
         if not text:
             raise HTTPException(status_code=400, detail="Text is required")
         
-        analysis = analyze_text_sentiment(text)
+        async with admission_controller.admit(user_id, "/analyze-text", units=count_text_tokens(text)):
+            analysis = await run_in_threadpool(analyze_text_sentiment, text)
         analysis["user_id"] = user_id
         return analysis
     
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error analyzing text: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error analyzing text: {str(e)}")
@@ -664,10 +747,13 @@ async def generate_recommendations(request: Request, user_id: str = Depends(veri
         if not mood or not energy_level:
             raise HTTPException(status_code=400, detail="Missing required fields")
         
+        admission_controller.charge(user_id, "/generate-recommendations")
         recommendations = get_recommendations(mood, energy_level, detected_emotions)
         
         return {"recommendations": recommendations, "user_id": user_id}
     
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error generating recommendations: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error generating recommendations: {str(e)}")
@@ -676,65 +762,25 @@ async def generate_recommendations(request: Request, user_id: str = Depends(veri
 async def generate_summary(request: Request, user_id: str = Depends(verify_token)):
     """Generate weekly summary insights based on check-in data."""
     try:
-        data = await request.json()
-        check_ins = data.get("checkIns", [])
+        # Stream check-ins (JSON or NDJSON) into running statistics
+        summary = await read_check_ins(request)
         
-        if not check_ins:
+        if not summary.count:
             raise HTTPException(status_code=400, detail="No check-in data provided")
         
-        # Analyze mood patterns
-        moods = [check_in.get("mood") for check_in in check_ins]
-        scores = [check_in.get("moodScore") for check_in in check_ins]
-        energy_levels = [check_in.get("energyLevel") for check_in in check_ins]
+        admission_controller.charge(user_id, "/generate-summary", units=summary.count)
         
         # Calculate average mood score and energy level
-        avg_score = sum(scores) / len(scores) if scores else 0
-        avg_energy = sum(energy_levels) / len(energy_levels) if energy_levels else 0
-        
-        # Count mood frequencies
-        mood_counts = {}
-        for mood in moods:
-            if mood:
-                mood_counts[mood] = mood_counts.get(mood, 0) + 1
+        avg_score = summary.avg_score
+        avg_energy = summary.avg_energy
         
         # Get most common mood
-        most_common_mood = max(mood_counts.items(), key=lambda x: x[1])[0] if mood_counts else "neutral"
-        
-        # Generate insights
-        insights = f"This week, your average mood score was {avg_score:.1f}/10 and your average energy level was {avg_energy:.1f}/10. "
-        insights += f"You most frequently reported feeling {most_common_mood}. "
-        
-        # Add trend analysis
-        if len(scores) >= 3:
-            if scores[-1] > scores[0]:
-                insights += "Your mood has been improving over the week. "
-            elif scores[-1] < scores[0]:
-                insights += "Your mood has slightly declined over the week. "
-            else:
-                insights += "Your mood has remained relatively stable. "
-        
-        # Add recommendations based on mood patterns
-        recommendations = "Based on your mood patterns this week, consider the following:\n\n"
-        
-        if avg_score < 4:
-            recommendations += "• Your mood has been on the lower side. Consider scheduling time with a trusted friend or mental health professional.\n"
-            recommendations += "• Set aside time each day for self-care activities that have helped you feel better in the past.\n"
-            recommendations += "• Ensure you're getting adequate sleep, nutrition, and some light physical activity.\n"
-        elif avg_score < 7:
-            recommendations += "• Your mood has been moderate. Pay attention to what activities boost your mood and try to incorporate more of them.\n"
-            recommendations += "• Practice mindfulness or meditation to help maintain emotional balance.\n"
-            recommendations += "• Consider setting small, achievable goals to build momentum and confidence.\n"
-        else:
-            recommendations += "• Your mood has been positive! Reflect on what's working well and continue these practices.\n"
-            recommendations += "• Share your positive energy with others through acts of kindness or connection.\n"
-            recommendations += "• Document what's going well to reference during more challenging times.\n"
+        most_common_mood = summary.most_common_mood or "neutral"
         
-        if avg_energy < 4:
-            recommendations += "• Your energy has been low. Check your sleep quality and quantity.\n"
-            recommendations += "• Consider gentle exercise like walking or stretching to naturally boost energy.\n"
-        elif avg_energy > 7:
-            recommendations += "• You've had high energy. Channel this productively into activities that matter to you.\n"
-            recommendations += "• Ensure you're also building in adequate rest periods to sustain your energy.\n"
+        insights, recommendations = build_summary_text(
+            avg_score, avg_energy, most_common_mood,
+            summary.score_count, summary.first_score, summary.last_score,
+        )
         
         return {
             "insights": insights,
@@ -742,30 +788,66 @@ async def generate_summary(request: Request, user_id: str = Depends(verify_token
             "user_id": user_id
         }
     
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error generating summary: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error generating summary: {str(e)}")
 
+@app.post("/generate-summaries")
+async def generate_summaries(request: Request, user_id: str = Depends(verify_token)):
+    """Generate weekly summaries for many users from one columnar payload or data file."""
+    try:
+        data = await request.json()
+        if not isinstance(data, dict):
+            raise HTTPException(status_code=400, detail="Request body must be a JSON object")
+        
+        if data.get("file"):
+            check_ins = await run_in_threadpool(load_check_in_file, data["file"])
+        else:
+            check_ins = load_columnar(data.get("checkIns"))
+        
+        if check_ins.empty:
+            raise HTTPException(status_code=400, detail="No check-in data provided")
+        
+        async with admission_controller.admit(user_id, "/generate-summaries", units=len(check_ins)):
+            stats = await run_in_threadpool(summarize_users, check_ins)
+            summaries = await run_in_threadpool(render_summaries, stats)
+        
+        return {"summaries": summaries, "user_id": user_id}
+    
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error generating summaries: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error generating summaries: {str(e)}")
+
 @app.post("/generate-pdf-report")
 async def generate_pdf_report(request: Request, user_id: str = Depends(verify_token)):
     """Generate and return a PDF report of mood check-ins."""
     try:
-        data = await request.json()
-        check_ins = data.get("checkIns", [])
+        # Stream check-ins (JSON or NDJSON) into running statistics and chart points
+        summary = await read_check_ins(request)
         
-        if not check_ins:
+        if not summary.count:
             raise HTTPException(status_code=400, detail="No check-in data provided")
         
         # Generate PDF
-        pdf_path = generate_mood_summary_pdf(check_ins, user_id)
+        async with admission_controller.admit(user_id, "/generate-pdf-report", units=summary.count):
+            pdf_path = await run_in_threadpool(generate_mood_summary_pdf, summary, user_id)
         
-        # Return the PDF file
+        # Return the PDF file and remove its temporary directory once it has been sent
         return FileResponse(
             path=pdf_path, 
             filename="mood_summary.pdf", 
-            media_type="application/pdf"
+            media_type="application/pdf",
+            background=BackgroundTask(shutil.rmtree, os.path.dirname(pdf_path), ignore_errors=True)
         )
     
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error generating PDF report: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error generating PDF report: {str(e)}")
@@ -789,6 +871,26 @@ async def get_stats(user_id: str = Depends(verify_token)):
         "user_id": user_id
     }
 
+def verify_profiling_access(x_profiling_token: str = Header(None), user_id: str = Depends(verify_token)):
+    """Debug endpoints also need the operator token from AI_SERVICE_PROFILING_TOKEN."""
+    if profiler is None:
+        raise HTTPException(status_code=404, detail="Profiling is not enabled")
+    expected = os.getenv("AI_SERVICE_PROFILING_TOKEN")
+    if not expected or not x_profiling_token or not secrets.compare_digest(x_profiling_token, expected):
+        raise HTTPException(status_code=403, detail="Profiling access denied")
+    return user_id
+
+@app.get("/debug/profile")
+async def debug_profile(top: int = 15, user_id: str = Depends(verify_profiling_access)):
+    """Per-endpoint resource deltas and the fastest growing allocation sites."""
+    return await run_in_threadpool(profiler.report, top)
+
+@app.post("/debug/profile/reset")
+async def reset_profile(user_id: str = Depends(verify_profiling_access)):
+    """Start a new profiling baseline."""
+    await run_in_threadpool(profiler.reset)
+    return {"status": "reset", "timestamp": datetime.now().isoformat()}
+
 def verify_token(authorization: str = Header(None)):
     if not authorization:
         raise HTTPException(status_code=401, detail="Authorization header missing")
@@ -0,0 +1,165 @@
+"""Opt-in per-endpoint resource profiling (``AI_SERVICE_PROFILING=1``).
+
+For every request the middleware records how RSS, open file descriptors,
+temp directory usage and tracemalloc-traced memory changed, aggregated per
+endpoint. ``/debug/profile`` reports these together with the allocation
+sites that grew most since the baseline snapshot. The soak driver in
+``benchmarks/soak.py`` uses the endpoint to spot steady growth.
+
+While profiling is on, ``tempfile`` is pointed at a directory owned by the
+service, so the temp readings cover only this process's files and stay
+cheap to take on a busy shared ``/tmp``.
+
+tracemalloc slows allocation-heavy code such as chart rendering by an order
+of magnitude, so it only runs when ``AI_SERVICE_PROFILING_FRAMES`` is above
+zero; the other readings are cheap and always collected.
+
+Readings are process-wide, so when requests overlap each one is also
+credited with whatever the others did in the meantime. Per-endpoint numbers
+are only reliable for sequential traffic, which is what the soak driver
+sends.
+"""
+import os
+import resource
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def rss_bytes():
+    """Current resident set size; falls back to peak RSS where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * PAGE_SIZE
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def open_fds():
+    for path in ("/proc/self/fd", "/dev/fd"):
+        try:
+            return len(os.listdir(path))
+        except OSError:
+            continue
+    return -1
+
+
+def temp_usage(path):
+    """Number of top-level entries and total bytes in the temp directory."""
+    entries, total = 0, 0
+    for root, dirs, files in os.walk(path):
+        if root == path:
+            entries = len(dirs) + len(files)
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return entries, total
+
+
+def sample(temp_dir):
+    """One reading of every tracked resource."""
+    entries, temp_bytes = temp_usage(temp_dir)
+    traced = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+    return {
+        "rss": rss_bytes(),
+        "fds": open_fds(),
+        "temp_entries": entries,
+        "temp_bytes": temp_bytes,
+        "traced": traced,
+    }
+
+
+class Profiler:
+    def __init__(self, temp_dir, frames=0):
+        self.temp_dir = temp_dir
+        self.endpoints = {}
+        self.baseline = None
+        if frames > 0:
+            tracemalloc.start(frames)
+            self.baseline = tracemalloc.take_snapshot()
+        self.started = time.time()
+
+    def reset(self):
+        """Take a new baseline snapshot and clear per-endpoint statistics."""
+        if self.baseline is not None:
+            self.baseline = tracemalloc.take_snapshot()
+        self.endpoints.clear()
+
+    def record(self, endpoint, before, after, duration):
+        stats = self.endpoints.setdefault(endpoint, {"requests": 0, "seconds": 0.0, "deltas": {key: 0 for key in before}})
+        stats["requests"] += 1
+        stats["seconds"] += duration
+        for key in before:
+            stats["deltas"][key] += after[key] - before[key]
+
+    def top_allocations(self, limit=15):
+        """Allocation sites that grew most since the baseline snapshot."""
+        if self.baseline is None:
+            return []
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ])
+        diff = snapshot.compare_to(self.baseline, "lineno")
+        return [
+            {"location": str(stat.traceback[0]), "size_diff": stat.size_diff, "count_diff": stat.count_diff}
+            for stat in [stat for stat in diff if stat.size_diff > 0][:limit]
+        ]
+
+    def report(self, top=15):
+        return {
+            "uptime": time.time() - self.started,
+            "process": sample(self.temp_dir),
+            "endpoints": self.endpoints,
+            "tracing": self.baseline is not None,
+            "top_allocations": self.top_allocations(top) if top else [],
+        }
+
+
+class ProfilingMiddleware:
+    """ASGI middleware that samples resources around each HTTP request.
+
+    The second sample is taken once the response has been sent and its
+    background tasks (such as temp file cleanup) have run. Requests are
+    grouped by the route template they matched, so path parameters do not
+    split an endpoint; requests that match no route are not recorded, so
+    probing for unknown URLs cannot grow the statistics without bound.
+    """
+
+    def __init__(self, app, profiler):
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith("/debug/"):
+            await self.app(scope, receive, send)
+            return
+
+        before = sample(self.profiler.temp_dir)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            # The router adds the matched route to the scope it was given
+            route = scope.get("route")
+            if route is not None:
+                after = sample(self.profiler.temp_dir)
+                self.profiler.record(route.path, before, after, time.perf_counter() - started)
+
+
+def install(app):
+    """Attach the profiling middleware to ``app``, tracing allocations if configured.
+
+    Also redirects ``tempfile`` to a fresh directory owned by this process,
+    removed again when the app shuts down.
+    """
+    tempfile.tempdir = tempfile.mkdtemp(prefix="ai-service-")
+    profiler = Profiler(tempfile.tempdir, frames=int(os.getenv("AI_SERVICE_PROFILING_FRAMES", "0")))
+    app.add_event_handler("shutdown", lambda: shutil.rmtree(profiler.temp_dir, ignore_errors=True))
+    app.add_middleware(ProfilingMiddleware, profiler=profiler)
+    return profiler
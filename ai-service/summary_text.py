@@ -0,0 +1,138 @@
+"""Summary and report text rendered from a compiled rule set.
+
+The score bands and text blocks live in ``summary_rules.json``. They are
+compiled once at import into band classifiers and pre-parsed templates, and
+``/generate-summary``, ``/generate-summaries`` and the PDF report all render
+from the same compiled rules, so their thresholds cannot drift apart.
+"""
+import json
+import os
+from string import Formatter
+
+RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "summary_rules.json")
+
+
+def _compile_bands(bands):
+    """Turn ``[{"name", "below" | "at_most"}, ...]`` into ``[(name, bound, inclusive)]``."""
+    compiled = []
+    for band in bands:
+        if "below" in band:
+            compiled.append((band["name"], band["below"], False))
+        elif "at_most" in band:
+            compiled.append((band["name"], band["at_most"], True))
+        else:
+            compiled.append((band["name"], None, False))
+    return compiled
+
+
+def _classify(bands, value):
+    for name, bound, inclusive in bands:
+        if bound is None or value < bound or (inclusive and value == bound):
+            return name
+    return None
+
+
+def _compile_template(text):
+    """Pre-parse a format string; constant text compiles to itself."""
+    parts = []
+    for literal, field, spec, conversion in Formatter().parse(text):
+        if literal:
+            parts.append(literal)
+        if field is not None:
+            parts.append((field, spec or ""))
+    if all(isinstance(part, str) for part in parts):
+        return "".join(parts)
+    return tuple(parts)
+
+
+class _Select:
+    """A block that picks one compiled template by band name."""
+
+    __slots__ = ("band", "cases")
+
+    def __init__(self, band, cases):
+        self.band = band
+        self.cases = cases
+
+
+def _compile_block(block):
+    if isinstance(block, str):
+        return _compile_template(block)
+    return _Select(block["select"], {case: _compile_template(text) for case, text in block["cases"].items()})
+
+
+class CompiledRules:
+    """Band classifiers and compiled document templates from a rule definition."""
+
+    def __init__(self, definition):
+        bands = definition["bands"]
+        self.mood_bands = _compile_bands(bands["mood"])
+        self.energy_bands = _compile_bands(bands["energy"])
+        self.trend_min_scores = bands["trend"]["min_scores"]
+        self.documents = {
+            document: {section: [_compile_block(block) for block in blocks] for section, blocks in sections.items()}
+            for document, sections in definition["documents"].items()
+        }
+
+    def bands_for(self, stats):
+        """Band names for the ``mood``, ``energy`` and ``trend`` selectors."""
+        trend = None
+        if stats["score_count"] >= self.trend_min_scores:
+            first, last = stats["first_score"], stats["last_score"]
+            trend = "improving" if last > first else "declining" if last < first else "stable"
+        return {
+            "mood": _classify(self.mood_bands, stats["avg_score"]),
+            "energy": _classify(self.energy_bands, stats["avg_energy"]),
+            "trend": trend,
+        }
+
+    def render(self, document, stats):
+        """Render every section of ``document``; returns ``{section: text}``."""
+        bands = self.bands_for(stats)
+        rendered = {}
+        for section, blocks in self.documents[document].items():
+            pieces = []
+            for block in blocks:
+                if block.__class__ is _Select:
+                    block = block.cases.get(bands[block.band], "")
+                if block.__class__ is str:
+                    pieces.append(block)
+                    continue
+                for part in block:
+                    pieces.append(part if part.__class__ is str else format(stats[part[0]], part[1]))
+            rendered[section] = "".join(pieces)
+        return rendered
+
+
+def load_rules(path=RULES_PATH):
+    with open(path, encoding="utf-8") as f:
+        return CompiledRules(json.load(f))
+
+
+RULES = load_rules()
+
+
+def build_summary_text(avg_score, avg_energy, most_common_mood, score_count, first_score, last_score):
+    """Return ``(insights, recommendations)`` for one user's weekly statistics."""
+    text = RULES.render("summary", {
+        "avg_score": avg_score,
+        "avg_energy": avg_energy,
+        "most_common_mood": most_common_mood,
+        "score_count": score_count,
+        "first_score": first_score,
+        "last_score": last_score,
+    })
+    return text["insights"], text["recommendations"]
+
+
+def build_report_text(avg_score, avg_energy, most_common_mood):
+    """Return ``(statistics_lines, recommendations)`` for the PDF report body."""
+    text = RULES.render("report", {
+        "avg_score": avg_score,
+        "avg_energy": avg_energy,
+        "most_common_mood": most_common_mood,
+        "score_count": 0,
+        "first_score": None,
+        "last_score": None,
+    })
+    return text["statistics"].split("\n"), text["recommendations"]
@@ -0,0 +1,159 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+import admission as admission_module
+from admission import (
+    AdmissionController, MemoryBucketStore, Priority, PriorityGate, SQLiteBucketStore, estimate_audio_seconds,
+    request_cost,
+)
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return MemoryBucketStore()
+    return SQLiteBucketStore(str(tmp_path / "buckets.db"))
+
+
+def test_bucket_admits_until_empty(store):
+    assert store.take("u", 4, capacity=10, refill_rate=1, now=0) == 0
+    assert store.take("u", 6, capacity=10, refill_rate=1, now=0) == 0
+    assert store.take("u", 2, capacity=10, refill_rate=1, now=0) == pytest.approx(2)
+
+
+def test_bucket_refills_up_to_capacity(store):
+    store.take("u", 10, capacity=10, refill_rate=2, now=0)
+    assert store.take("u", 4, capacity=10, refill_rate=2, now=2) == 0
+    assert store.take("u", 10, capacity=10, refill_rate=2, now=100) == 0
+
+
+def test_buckets_are_per_user(store):
+    store.take("a", 10, capacity=10, refill_rate=1, now=0)
+    assert store.take("b", 10, capacity=10, refill_rate=1, now=0) == 0
+
+
+def test_refund_returns_credits_without_exceeding_capacity(store):
+    store.take("u", 8, capacity=10, refill_rate=1, now=0)
+    store.refund("u", 8, capacity=10, refill_rate=1, now=0)
+    assert store.take("u", 10, capacity=10, refill_rate=1, now=0) == 0
+    store.refund("u", 50, capacity=10, refill_rate=1, now=0)
+    assert store.take("u", 11, capacity=10, refill_rate=1, now=0) == pytest.approx(1)
+
+
+def test_sqlite_buckets_are_shared_between_connections(tmp_path):
+    path = str(tmp_path / "buckets.db")
+    SQLiteBucketStore(path).take("u", 10, capacity=10, refill_rate=1, now=0)
+    assert SQLiteBucketStore(path).take("u", 5, capacity=10, refill_rate=1, now=0) == pytest.approx(5)
+
+
+def test_gate_limits_lower_priority_classes():
+    async def scenario():
+        gate = PriorityGate(slots=4)
+        assert await gate.acquire(Priority.BULK, timeout=0.1)
+        assert await gate.acquire(Priority.BULK, timeout=0.1)
+        assert not await gate.acquire(Priority.BULK, timeout=0.05)
+        assert await gate.acquire(Priority.STANDARD, timeout=0.1)
+        assert not await gate.acquire(Priority.STANDARD, timeout=0.05)
+        assert await gate.acquire(Priority.INTERACTIVE, timeout=0.1)
+        assert gate.in_flight == 4
+
+    asyncio.run(scenario())
+
+
+def test_gate_serves_waiting_higher_priority_first():
+    async def scenario():
+        gate = PriorityGate(slots=1)
+        order = []
+        assert await gate.acquire(Priority.INTERACTIVE, timeout=0.1)
+
+        async def worker(priority):
+            assert await gate.acquire(priority, timeout=1)
+            order.append(priority)
+            await gate.release()
+
+        bulk = asyncio.create_task(worker(Priority.BULK))
+        await asyncio.sleep(0)
+        interactive = asyncio.create_task(worker(Priority.INTERACTIVE))
+        await asyncio.sleep(0)
+        await gate.release()
+        await asyncio.gather(bulk, interactive)
+        return order
+
+    assert asyncio.run(scenario()) == [Priority.INTERACTIVE, Priority.BULK]
+
+
+def test_gate_timeout_wakes_lower_priority_waiters():
+    async def scenario():
+        gate = PriorityGate(slots=2)
+        assert await gate.acquire(Priority.INTERACTIVE, timeout=0.1)
+        assert await gate.acquire(Priority.INTERACTIVE, timeout=0.1)
+        # An interactive waiter blocks the bulk one until it gives up
+        interactive = asyncio.create_task(gate.acquire(Priority.INTERACTIVE, timeout=0.05))
+        await asyncio.sleep(0)
+        bulk = asyncio.create_task(gate.acquire(Priority.BULK, timeout=1))
+        await asyncio.sleep(0)
+        assert not await interactive
+        await gate.release()
+        await gate.release()
+        return await bulk
+
+    assert asyncio.run(scenario())
+
+
+def controller(capacity=10, slots=1):
+    return AdmissionController(MemoryBucketStore(), capacity=capacity, refill_rate=0.001, slots=slots, asr_slots=1)
+
+
+def test_charge_raises_429_with_retry_after():
+    admission = controller(capacity=1)
+    admission.charge("u", "/analyze-text")
+    with pytest.raises(HTTPException) as error:
+        admission.charge("u", "/analyze-text")
+    assert error.value.status_code == 429
+    assert int(error.value.headers["Retry-After"]) > 0
+
+
+def test_shed_request_is_refunded(monkeypatch):
+    monkeypatch.setitem(admission_module.QUEUE_TIMEOUTS, Priority.BULK, 0.01)
+    cost = request_cost("/generate-pdf-report", 10)
+    admission = controller(capacity=cost + 1)
+
+    async def scenario():
+        assert await admission.gate.acquire(Priority.INTERACTIVE, timeout=0.1)
+        with pytest.raises(HTTPException) as error:
+            async with admission.admit("u", "/generate-pdf-report", units=10):
+                pass
+        assert error.value.status_code == 503
+
+    asyncio.run(scenario())
+    # The full bucket is still available after the 503
+    assert admission.charge("u", "/generate-pdf-report", units=10) == cost
+
+
+def test_disabled_controller_admits_everything():
+    admission = AdmissionController(MemoryBucketStore(), 1, 0.001, slots=1, asr_slots=0, enabled=False)
+
+    async def scenario():
+        for _ in range(5):
+            async with admission.admit("u", "/generate-pdf-report", units=1000):
+                pass
+
+    asyncio.run(scenario())
+    with admission.asr_slot() as available:
+        assert available
+
+
+def test_asr_slot_degrades_when_saturated():
+    admission = controller()
+    with admission.asr_slot() as first:
+        with admission.asr_slot() as second:
+            assert first and not second
+    assert admission.asr_in_flight == 0
+
+
+def test_audio_seconds_estimated_from_upload_size():
+    assert estimate_audio_seconds(320000, ".wav") == pytest.approx(10)
+    assert estimate_audio_seconds(40000, ".webm") == pytest.approx(10)
+    assert estimate_audio_seconds(0, ".mp3") == 0
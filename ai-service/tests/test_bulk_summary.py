@@ -0,0 +1,72 @@
+import pandas as pd
+import pytest
+
+from bulk_summary import load_check_in_file, load_columnar, render_summaries, summarize_users
+
+COLUMNS = {
+    "userId": ["a", "b", "a"],
+    "mood": ["happy", "sad", "happy"],
+    "moodScore": [8, 3, 6],
+    "energyLevel": [7, 2, 5],
+}
+
+
+@pytest.mark.parametrize("columns, message", [
+    ([1], "object"),
+    (None, "object"),
+    ({"userId": ["a"]}, "Missing columns"),
+    ({**COLUMNS, "userId": 5}, "must be arrays"),
+    ({**COLUMNS, "moodScore": "8,3,6"}, "must be arrays"),
+    ({**COLUMNS, "mood": ["happy"]}, "same length"),
+    ({**COLUMNS, "moodScore": ["a", 3, 6]}, "moodScore must be numeric"),
+    ({**COLUMNS, "energyLevel": [7, [2], 5]}, "energyLevel must be numeric"),
+])
+def test_load_columnar_rejects_bad_input(columns, message):
+    with pytest.raises(ValueError, match=message):
+        load_columnar(columns)
+
+
+def test_summaries_per_user():
+    summaries = render_summaries(summarize_users(load_columnar(COLUMNS)))
+    assert [(s["userId"], s["checkIns"]) for s in summaries] == [("a", 2), ("b", 1)]
+    assert "average mood score was 7.0/10" in summaries[0]["insights"]
+
+
+@pytest.mark.parametrize("name, write", [
+    ("week.csv", lambda df, path: df.to_csv(path, index=False)),
+    ("week.parquet", lambda df, path: df.to_parquet(path)),
+    ("week.ndjson", lambda df, path: df.to_json(path, orient="records", lines=True)),
+])
+def test_load_check_in_file_formats(tmp_path, name, write):
+    write(pd.DataFrame(COLUMNS), tmp_path / name)
+    df = load_check_in_file(name, data_dir=str(tmp_path))
+    assert df["moodScore"].tolist() == [8, 3, 6]
+
+
+@pytest.mark.parametrize("name", ["../outside.csv", 5, "missing.csv", "week.txt"])
+def test_load_check_in_file_rejects_bad_names(tmp_path, name):
+    (tmp_path / "week.txt").write_text("")
+    with pytest.raises(ValueError):
+        load_check_in_file(name, data_dir=str(tmp_path))
+
+
+def test_numeric_strings_are_coerced():
+    df = load_columnar({**COLUMNS, "moodScore": ["8", "3", None]})
+    assert summarize_users(df)["avg_score"].tolist() == [8.0, 3.0]
+
+
+@pytest.mark.parametrize("name, write", [
+    ("week.csv", lambda df, path: df.to_csv(path, index=False)),
+    ("week.parquet", lambda df, path: df.to_parquet(path)),
+    ("week.ndjson", lambda df, path: df.to_json(path, orient="records", lines=True)),
+])
+def test_load_check_in_file_rejects_missing_columns(tmp_path, name, write):
+    write(pd.DataFrame(COLUMNS).drop(columns=["energyLevel"]), tmp_path / name)
+    with pytest.raises(ValueError):
+        load_check_in_file(name, data_dir=str(tmp_path))
+
+
+def test_load_check_in_file_rejects_non_numeric_scores(tmp_path):
+    pd.DataFrame({**COLUMNS, "moodScore": ["high", "low", "high"]}).to_csv(tmp_path / "week.csv", index=False)
+    with pytest.raises(ValueError, match="moodScore must be numeric"):
+        load_check_in_file("week.csv", data_dir=str(tmp_path))
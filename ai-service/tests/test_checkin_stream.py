@@ -0,0 +1,184 @@
+import asyncio
+import json
+
+import pytest
+
+from checkin_stream import CheckInAggregator, JSONArrayParser, NDJSONParser, ingest_check_ins
+
+CHECK_INS = [
+    {"mood": "happy", "moodScore": 8, "energyLevel": 7, "createdAt": "2024-03-01T09:00:00Z", "note": "café ☕"},
+    {"mood": "calm", "moodScore": 6, "energyLevel": 5, "createdAt": "2024-03-02T09:00:00Z"},
+    {"mood": "happy", "moodScore": 7, "energyLevel": 6, "createdAt": "2024-03-03T09:00:00+00:00"},
+]
+
+
+def ingest(body, content_type="application/json", chunk_size=None, split_at=None):
+    """Run ``ingest_check_ins`` over ``body`` cut into chunks of bytes."""
+    data = body.encode("utf-8")
+    if split_at is not None:
+        chunks = [data[:split_at], data[split_at:]]
+    else:
+        size = chunk_size or len(data) or 1
+        chunks = [data[i:i + size] for i in range(0, len(data), size)]
+
+    async def stream():
+        for chunk in chunks:
+            yield chunk
+
+    return asyncio.run(ingest_check_ins(stream(), content_type))
+
+
+def summary(aggregator):
+    return (
+        aggregator.count, aggregator.avg_score, aggregator.avg_energy, aggregator.most_common_mood,
+        aggregator.first_score, aggregator.last_score,
+    )
+
+
+EXPECTED = (3, 7.0, 6.0, "happy", 8, 7)
+
+
+def test_object_body_split_at_every_byte():
+    body = json.dumps({"userId": "u1", "checkIns": CHECK_INS}, ensure_ascii=False)
+    for split_at in range(len(body.encode("utf-8")) + 1):
+        assert summary(ingest(body, split_at=split_at)) == EXPECTED, split_at
+
+
+def test_split_inside_check_ins_key():
+    body = json.dumps({"userId": "u1", "checkIns": CHECK_INS})
+    key = body.index('"checkIns"')
+    for split_at in range(key, key + len('"checkIns": [')):
+        assert summary(ingest(body, split_at=split_at)) == EXPECTED
+
+
+def test_check_ins_key_after_long_prefix():
+    body = json.dumps({"padding": "x" * 10_000, "checkIns": CHECK_INS})
+    assert summary(ingest(body, chunk_size=7)) == EXPECTED
+
+
+def test_split_inside_multibyte_character():
+    body = json.dumps({"checkIns": CHECK_INS}, ensure_ascii=False)
+    data = body.encode("utf-8")
+    cut = data.index("☕".encode("utf-8")) + 1
+    assert summary(ingest(body, split_at=cut)) == EXPECTED
+    assert summary(ingest(body, chunk_size=1)) == EXPECTED
+
+
+def test_top_level_array():
+    body = json.dumps(CHECK_INS, ensure_ascii=False)
+    for chunk_size in (1, 5, len(body)):
+        assert summary(ingest(body, chunk_size=chunk_size)) == EXPECTED
+
+
+def test_ndjson_split_across_chunks():
+    body = "\n".join(json.dumps(check_in, ensure_ascii=False) for check_in in CHECK_INS)
+    for chunk_size in (1, 3, len(body)):
+        assert summary(ingest(body, "application/x-ndjson", chunk_size=chunk_size)) == EXPECTED
+
+
+@pytest.mark.parametrize("body", [
+    '{"checkIns": [{"moodScore": 5}, {"moodScore": 6',
+    '{"checkIns": [{"moodScore": 5},',
+    '[{"moodScore": 5}',
+])
+def test_truncated_array_is_rejected(body):
+    with pytest.raises(ValueError):
+        ingest(body, chunk_size=4)
+
+
+def test_truncated_ndjson_line_is_rejected():
+    with pytest.raises(ValueError):
+        ingest('{"moodScore": 5}\n{"moodScore": ', "application/x-ndjson")
+
+
+@pytest.mark.parametrize("body", ["{bad", '{"checkIns": 5', "not json at all"])
+def test_malformed_body_without_array_is_rejected(body):
+    with pytest.raises(ValueError, match="not valid JSON"):
+        ingest(body, chunk_size=2)
+
+
+@pytest.mark.parametrize("body", ["", '{"userId": "u1"}', "[]"])
+def test_body_without_check_ins_is_empty(body):
+    assert ingest(body).count == 0
+
+
+def test_parsers_return_nothing_until_an_element_completes():
+    parser = JSONArrayParser()
+    assert parser.feed('{"checkIns": [{"moodScore": 1') == []
+    assert parser.feed('}, {"moodScore"') == [{"moodScore": 1}]
+    assert parser.feed(': 2}]}') == [{"moodScore": 2}]
+    assert parser.close() == []
+
+    parser = NDJSONParser()
+    assert parser.feed('{"moodScore": 1}') == []
+    assert parser.feed("\n") == [{"moodScore": 1}]
+    assert parser.close() == []
+
+
+def check_in(day, score):
+    return {"moodScore": score, "energyLevel": score, "createdAt": f"2024-01-{day:02d}T00:00:00Z"}
+
+
+def test_plot_points_kept_one_per_check_in_below_max_points():
+    aggregator = CheckInAggregator(max_points=8).extend(check_in(day, day) for day in range(1, 8))
+    dates, scores, energies = aggregator.plot_points()
+    assert scores == [float(day) for day in range(1, 8)]
+    assert [date.day for date in dates] == list(range(1, 8))
+
+
+def test_buckets_merge_at_exactly_max_points():
+    aggregator = CheckInAggregator(max_points=8).extend(check_in(day, day) for day in range(1, 9))
+    dates, scores, energies = aggregator.plot_points()
+    # The eighth point fills the buffer, so neighbours are averaged pairwise
+    assert scores == [1.5, 3.5, 5.5, 7.5]
+    assert energies == scores
+    assert [date.day for date in dates] == [1, 3, 5, 7]
+    assert aggregator.count == 8
+    assert aggregator.avg_score == 4.5
+
+
+def test_buckets_stay_bounded_and_cover_every_check_in():
+    aggregator = CheckInAggregator(max_points=8).extend(check_in(day % 28 + 1, day % 10) for day in range(1000))
+    dates, scores, energies = aggregator.plot_points()
+    assert len(dates) <= 8
+    bucket_rows = sum(bucket[1] for bucket in aggregator._buckets) + aggregator._current_rows
+    assert bucket_rows == 1000
+
+
+def test_missing_values_plot_as_nan():
+    aggregator = CheckInAggregator().extend([{"createdAt": "2024-01-01T00:00:00Z", "moodScore": 5}])
+    _, scores, energies = aggregator.plot_points()
+    assert scores == [5.0]
+    assert energies[0] != energies[0]
+
+
+def test_malformed_element_does_not_buffer_the_rest_of_the_body():
+    parser = JSONArrayParser(max_pending=1000)
+    parser.feed('{"checkIns": [{"mood": x}, ')
+    row = json.dumps(CHECK_INS[1]) + ", "
+    with pytest.raises(ValueError, match="malformed"):
+        for _ in range(100):
+            parser.feed(row)
+    assert len(parser._buffer) <= 1000 + len(row)
+
+
+def test_newline_free_ndjson_is_rejected():
+    parser = NDJSONParser(max_pending=1000)
+    row = json.dumps(CHECK_INS[1])
+    with pytest.raises(ValueError, match="longer than"):
+        for _ in range(100):
+            parser.feed(row)
+
+
+def test_long_prefix_without_array_is_not_kept():
+    parser = JSONArrayParser(max_pending=1000)
+    parser.feed('{"notes": "' + "x" * 5000)
+    parser.feed('"}')
+    assert parser._skipped is None
+    with pytest.raises(ValueError, match="No check-in array"):
+        parser.close()
+
+
+def test_large_valid_body_stays_within_pending_limit():
+    body = json.dumps({"checkIns": [check_in(day % 28 + 1, day % 10) for day in range(20_000)]})
+    assert ingest(body, chunk_size=65536).count == 20_000
@@ -0,0 +1,137 @@
+import os
+
+import numpy as np
+import pytest
+
+from fusion import (
+    ACOUSTIC_DIM, CENTROID, EMOTION_LABELS, MOODS, RMS, TEMPO, TEXT_DIM, ZCR, LinearFusion, PriorFusion,
+    acoustic_feature_vector, fit_linear_fusion, text_feature_vector,
+)
+
+
+def acoustic(rms=0.07, tempo=110.0, zcr=0.05, centroid=1500.0):
+    features = np.zeros(ACOUSTIC_DIM)
+    features[[RMS, TEMPO, ZCR, CENTROID]] = rms, tempo, zcr, centroid
+    return features
+
+
+TIRED = acoustic(rms=0.06, tempo=80.0)
+
+
+@pytest.fixture(scope="module")
+def main_module():
+    os.environ.setdefault("AI_SERVICE_TINY_MODELS", "1")
+    return pytest.importorskip("main")
+
+
+def test_acoustic_layout_matches_extract_audio_features(main_module, tmp_path):
+    sf = pytest.importorskip("soundfile")
+    sr = 16000
+    t = np.arange(2 * sr) / sr
+    path = str(tmp_path / "tone.wav")
+    sf.write(path, 0.3 * np.sin(2 * np.pi * 220 * t), sr)
+
+    features = main_module.extract_audio_features(path)
+    vector = acoustic_feature_vector(features)
+    assert vector.shape == (ACOUSTIC_DIM,)
+    assert vector[:13].tolist() == features["mfcc_mean"]
+    assert vector[CENTROID] == features["centroid_mean"]
+    assert vector[CENTROID + 1:ZCR].tolist() == features["contrast_mean"]
+    assert vector[ZCR] == features["zcr_mean"]
+    assert vector[RMS] == features["rms_mean"]
+    assert vector[TEMPO] == features["tempo"]
+
+
+def test_text_vector_spreads_missing_emotion_mass():
+    vector = text_feature_vector({"sentimentScore": -0.75, "emotion_scores": {"joy": 0.5, "sadness": 0.2}})
+    assert vector.shape == (TEXT_DIM,)
+    # Negative scores are stored as -(1 - positive)
+    assert vector[:2].tolist() == pytest.approx([0.75, 0.25])
+    emotions = dict(zip(EMOTION_LABELS, vector[2:]))
+    assert emotions["joy"] == 0.5 and emotions["sadness"] == 0.2
+    assert sum(emotions.values()) == pytest.approx(1.0)
+    assert emotions["anger"] == pytest.approx(0.3 / 5)
+
+
+def test_text_vector_without_analysis_is_uniform():
+    vector = text_feature_vector(None)
+    assert vector[:2].tolist() == [0.5, 0.5]
+    assert vector[2:] == pytest.approx(np.full(len(EMOTION_LABELS), 1 / len(EMOTION_LABELS)))
+
+
+def test_prior_without_text_uses_voice_alone():
+    prior = PriorFusion()
+    probs = prior.predict_proba(text_feature_vector(None), TIRED, has_text=False)
+    assert probs == pytest.approx(prior.voice_distribution(np.atleast_2d(TIRED)))
+    assert MOODS[int(probs[0].argmax())] == "tired"
+
+
+def test_prior_mixes_rows_with_and_without_text():
+    prior = PriorFusion()
+    text = np.stack([text_feature_vector({"sentimentScore": 0.95, "emotion_scores": {"joy": 0.9}}),
+                     text_feature_vector(None)])
+    probs = prior.predict_proba(text, np.stack([TIRED, TIRED]), has_text=np.array([True, False]))
+    assert [MOODS[i] for i in probs.argmax(axis=1)] == ["happy", "tired"]
+
+
+@pytest.mark.parametrize("model", [
+    PriorFusion(),
+    LinearFusion(np.ones((TEXT_DIM + ACOUSTIC_DIM, len(MOODS))), np.zeros(len(MOODS)),
+                 np.zeros(TEXT_DIM + ACOUSTIC_DIM), np.ones(TEXT_DIM + ACOUSTIC_DIM)),
+])
+def test_batch_and_single_clip_shapes(model):
+    text = np.stack([text_feature_vector(None)] * 4)
+    clips = np.stack([acoustic(rms=r) for r in (0.02, 0.06, 0.1, 0.2)])
+    batch = model.predict_proba(text, clips)
+    assert batch.shape == (4, len(MOODS))
+    assert batch.sum(axis=1) == pytest.approx(np.ones(4))
+    single = model.predict_proba(text[1], clips[1])
+    assert single.shape == (1, len(MOODS))
+    assert single[0] == pytest.approx(batch[1])
+
+
+def training_data(moods, n=120, seed=0):
+    rng = np.random.default_rng(seed)
+    labels = np.array([MOODS.index(moods[i % len(moods)]) for i in range(n)])
+    text = rng.random((n, TEXT_DIM))
+    features = rng.normal(size=(n, ACOUSTIC_DIM))
+    features[:, RMS] += labels
+    return text, features, labels
+
+
+def test_linear_fusion_round_trip(tmp_path):
+    pytest.importorskip("sklearn")
+    text, features, labels = training_data(["happy", "sad", "tired"])
+    model = fit_linear_fusion(text, features, labels)
+    path = str(tmp_path / "fusion.npz")
+    model.save(path)
+    loaded = LinearFusion.load(path)
+    assert loaded.temperature == model.temperature
+    assert loaded.predict_proba(text, features) == pytest.approx(model.predict_proba(text, features))
+
+
+def test_linear_fusion_load_rejects_other_moods(tmp_path):
+    path = str(tmp_path / "fusion.npz")
+    np.savez(path, weights=np.zeros((2, 2)), bias=np.zeros(2), mean=np.zeros(2), scale=np.ones(2),
+             temperature=1.0, moods=np.array(["happy", "sad"]))
+    with pytest.raises(ValueError, match="different moods"):
+        LinearFusion.load(path)
+
+
+def test_fit_linear_fusion_with_missing_moods():
+    pytest.importorskip("sklearn")
+    text, features, labels = training_data(["happy", "sad", "tired"])
+    probs = fit_linear_fusion(text, features, labels).predict_proba(text, features)
+    assert probs.shape == (len(labels), len(MOODS))
+    for mood in ("neutral", "anxious", "angry"):
+        assert probs[:, MOODS.index(mood)].max() < 1e-3
+
+
+def test_fit_linear_fusion_with_two_classes():
+    pytest.importorskip("sklearn")
+    text, features, labels = training_data(["sad", "tired"])
+    model = fit_linear_fusion(text, features, labels)
+    probs = model.predict_proba(text, features)
+    assert probs[:, [MOODS.index("sad"), MOODS.index("tired")]].sum(axis=1) == pytest.approx(np.ones(len(labels)))
+    # The rms offset separates the classes, so the binary model must rank them correctly
+    assert (np.array(MOODS)[probs.argmax(axis=1)] == np.array(MOODS)[labels]).mean() > 0.9
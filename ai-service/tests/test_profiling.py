@@ -0,0 +1,21 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from profiling import Profiler, ProfilingMiddleware
+
+
+def test_requests_are_grouped_by_route_template(tmp_path):
+    app = FastAPI()
+
+    @app.get("/users/{user_id}")
+    def get_user(user_id: str):
+        return {"userId": user_id}
+
+    profiler = Profiler(str(tmp_path))
+    app.add_middleware(ProfilingMiddleware, profiler=profiler)
+    client = TestClient(app)
+    for path in ("/users/a", "/users/b", "/missing", "/missing/1", "/debug/profile"):
+        client.get(path)
+
+    assert list(profiler.endpoints) == ["/users/{user_id}"]
+    assert profiler.endpoints["/users/{user_id}"]["requests"] == 2
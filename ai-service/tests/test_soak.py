@@ -0,0 +1,55 @@
+import pytest
+
+from benchmarks.soak import LEAK_THRESHOLDS, trends
+
+
+def samples(values, metric="temp_entries"):
+    """Soak samples where ``metric`` takes ``values`` and every other metric stays flat."""
+    return [{**{key: 100 for key in LEAK_THRESHOLDS}, metric: value} for value in values]
+
+
+def row(rows, metric):
+    return next(r for r in rows if r["metric"] == metric)
+
+
+def test_monotonic_growth_is_a_leak():
+    rows = trends(samples([10 * i for i in range(12)]), requests_per_round=10, warmup_rounds=0)
+    growth = row(rows, "temp_entries")
+    assert growth["per_round"] == pytest.approx(10)
+    assert growth["per_request"] == pytest.approx(1)
+    assert growth["rising"] == 1.0
+    assert growth["leak"]
+    assert [r["metric"] for r in rows if r["leak"]] == ["temp_entries"]
+
+
+def test_one_off_jump_is_not_a_leak():
+    # A cache filling once: the slope is steep but the metric rose in only one round
+    rows = trends(samples([0] * 6 + [1000] * 6), requests_per_round=10, warmup_rounds=0)
+    jump = row(rows, "temp_entries")
+    assert jump["per_request"] > LEAK_THRESHOLDS["temp_entries"]
+    assert jump["rising"] < 0.2
+    assert not jump["leak"]
+
+
+def test_warmup_rounds_are_trimmed():
+    # Growth during warmup only, flat afterwards
+    values = [0, 200, 400, 600] + [600] * 8
+    assert not row(trends(samples(values), 10, warmup_rounds=0), "temp_entries")["leak"]
+    steady = row(trends(samples(values), 10, warmup_rounds=4), "temp_entries")
+    assert steady["start"] == 600 and steady["end"] == 600
+    assert steady["per_round"] == 0
+    assert steady["rising"] == 0
+
+
+def test_growth_after_warmup_is_still_reported():
+    values = [0] * 4 + [100_000 * i for i in range(8)]
+    rows = trends(samples(values, metric="rss"), requests_per_round=1, warmup_rounds=4)
+    assert row(rows, "rss")["leak"]
+    assert row(rows, "rss")["start"] == 0
+
+
+@pytest.mark.parametrize("values", [[], [5]])
+def test_too_few_rounds(values):
+    rows = trends(samples(values), requests_per_round=10, warmup_rounds=0)
+    assert not any(r["leak"] for r in rows)
+    assert row(rows, "temp_entries")["per_round"] == 0.0
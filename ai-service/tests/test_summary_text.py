@@ -0,0 +1,84 @@
+import pytest
+
+from summary_text import RULES, build_report_text, build_summary_text
+
+SUMMARY_MOOD = {
+    "low": "Your mood has been on the lower side.",
+    "moderate": "Your mood has been moderate.",
+    "high": "Your mood has been positive!",
+}
+REPORT_MOOD = {
+    "low": "• Consider speaking with a mental health professional",
+    "moderate": "• Maintain healthy habits",
+    "high": "• Great job maintaining positive mental health",
+}
+SUMMARY_ENERGY = {
+    "low": "Your energy has been low.",
+    "high": "You've had high energy.",
+}
+
+
+def summary(avg_score=5.0, avg_energy=5.0, score_count=0, first_score=None, last_score=None):
+    return build_summary_text(avg_score, avg_energy, "calm", score_count, first_score, last_score)
+
+
+def bands_in(text, markers):
+    return [band for band, marker in markers.items() if marker in text]
+
+
+@pytest.mark.parametrize("avg_score, band", [
+    (0, "low"), (3.99, "low"), (4, "moderate"), (6.99, "moderate"), (7, "high"), (10, "high"),
+])
+def test_mood_band_edges(avg_score, band):
+    _, recommendations = summary(avg_score=avg_score)
+    assert bands_in(recommendations, SUMMARY_MOOD) == [band]
+
+
+@pytest.mark.parametrize("avg_energy, band", [
+    (3.99, "low"), (4, None), (7, None), (7.01, "high"),
+])
+def test_energy_band_edges(avg_energy, band):
+    _, recommendations = summary(avg_energy=avg_energy)
+    assert bands_in(recommendations, SUMMARY_ENERGY) == ([band] if band else [])
+
+
+@pytest.mark.parametrize("score_count, first_score, last_score, sentence", [
+    (3, 4, 8, "Your mood has been improving over the week."),
+    (3, 8, 4, "Your mood has slightly declined over the week."),
+    (5, 6, 6, "Your mood has remained relatively stable."),
+    (2, 4, 8, None),
+    (0, None, None, None),
+])
+def test_trend_sentence(score_count, first_score, last_score, sentence):
+    insights, _ = summary(score_count=score_count, first_score=first_score, last_score=last_score)
+    trend_sentences = [text for text in (
+        "Your mood has been improving over the week.",
+        "Your mood has slightly declined over the week.",
+        "Your mood has remained relatively stable.",
+    ) if text in insights]
+    assert trend_sentences == ([sentence] if sentence else [])
+
+
+def test_insights_format_statistics():
+    insights, recommendations = summary(avg_score=6.3, avg_energy=3.0)
+    assert insights.startswith(
+        "This week, your average mood score was 6.3/10 and your average energy level was 3.0/10. "
+        "You most frequently reported feeling calm. "
+    )
+    assert recommendations.startswith("Based on your mood patterns this week, consider the following:\n\n")
+
+
+@pytest.mark.parametrize("avg_score", [0, 2.5, 3.99, 4, 5.5, 6.99, 7, 8.5, 10])
+def test_report_and_summary_pick_the_same_mood_band(avg_score):
+    band = RULES.bands_for({
+        "avg_score": avg_score, "avg_energy": 5, "score_count": 0, "first_score": None, "last_score": None,
+    })["mood"]
+    _, summary_recommendations = summary(avg_score=avg_score)
+    statistics, report_recommendations = build_report_text(avg_score, 5.0, "calm")
+    assert bands_in(summary_recommendations, SUMMARY_MOOD) == [band]
+    assert bands_in(report_recommendations, REPORT_MOOD) == [band]
+    assert statistics == [
+        f"Average Mood Score: {avg_score:.1f}/10",
+        "Average Energy Level: 5.0/10",
+        "Most Common Mood: calm",
+    ]
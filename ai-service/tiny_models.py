@@ -0,0 +1,137 @@
+"""Small randomly initialised stand-ins for the Hugging Face pipelines.
+
+Enabled with ``AI_SERVICE_TINY_MODELS=1`` so the service and the benchmark
+suite can run offline without downloading any weights. Each stand-in is a
+real (tiny) torch model and returns results in the same shape as the
+pipeline it replaces, so the rest of ``main.py`` runs unchanged.
+"""
+import zlib
+
+import numpy as np
+import torch
+import librosa
+
+SENTIMENT_LABELS = ["NEGATIVE", "POSITIVE"]
+EMOTION_LABELS = ["anger", "disgust", "fear", "joy", "neutral", "sadness", "surprise"]
+
+# Words the tiny speech model can "transcribe" to; index 0 is the blank token
+SPEECH_VOCAB = [
+    "", "i", "feel", "today", "really", "good", "tired", "happy", "sad", "worried",
+    "calm", "work", "sleep", "friends", "great", "bad", "okay", "angry", "and", "so",
+]
+
+HASH_BUCKETS = 4096
+
+
+def _hash_tokens(text):
+    """Map whitespace tokens to embedding buckets without a vocabulary file."""
+    return [zlib.crc32(token.encode("utf-8")) % HASH_BUCKETS for token in text.lower().split()]
+
+
+def _randomize(module, seed):
+    generator = torch.Generator().manual_seed(seed)
+    with torch.no_grad():
+        for param in module.parameters():
+            param.copy_(torch.randn(param.shape, generator=generator) * 0.5)
+    module.eval()
+    return module
+
+
+class TinyTextClassifier(torch.nn.Module):
+    """Bag-of-hashed-words classifier used in place of the transformer models."""
+
+    def __init__(self, num_labels, dim=32):
+        super().__init__()
+        self.embedding = torch.nn.EmbeddingBag(HASH_BUCKETS, dim, mode="mean")
+        self.classifier = torch.nn.Linear(dim, num_labels)
+
+    def forward(self, token_ids, offsets):
+        return self.classifier(self.embedding(token_ids, offsets))
+
+
+class TinyTextPipeline:
+    """Mimics ``pipeline("sentiment-analysis" | "text-classification")``."""
+
+    def __init__(self, labels, top_k=None, seed=0):
+        self.labels = labels
+        self.top_k = top_k
+        self.model = _randomize(TinyTextClassifier(len(labels)), seed)
+
+    def __call__(self, inputs):
+        texts = [inputs] if isinstance(inputs, str) else list(inputs)
+
+        token_ids, offsets = [], []
+        for text in texts:
+            offsets.append(len(token_ids))
+            token_ids.extend(_hash_tokens(text) or [0])
+
+        with torch.no_grad():
+            logits = self.model(torch.tensor(token_ids), torch.tensor(offsets))
+            probs = torch.softmax(logits, dim=-1).tolist()
+
+        results = []
+        for row in probs:
+            ranked = sorted(zip(self.labels, row), key=lambda x: x[1], reverse=True)
+            if self.top_k is None:
+                label, score = ranked[0]
+                results.append({"label": label, "score": score})
+            else:
+                results.append([{"label": label, "score": score} for label, score in ranked[:self.top_k]])
+
+        # Like the real pipeline, a single string with top_k gives a flat list
+        if isinstance(inputs, str) and self.top_k is not None:
+            return results[0]
+        return results
+
+
+class TinySpeechModel(torch.nn.Module):
+    """Per-frame word classifier over log-mel features."""
+
+    def __init__(self, n_mels, vocab_size):
+        super().__init__()
+        self.conv = torch.nn.Conv1d(n_mels, vocab_size, kernel_size=3, padding=1)
+
+    def forward(self, mel):
+        return self.conv(mel)
+
+
+class TinySpeechPipeline:
+    """Mimics ``pipeline("automatic-speech-recognition")`` for file paths."""
+
+    sample_rate = 16000
+    n_mels = 16
+    # One emitted token per quarter second of audio
+    frames_per_token = 8
+
+    def __init__(self, seed=0):
+        self.model = _randomize(TinySpeechModel(self.n_mels, len(SPEECH_VOCAB)), seed)
+
+    def __call__(self, file_path):
+        y, sr = librosa.load(file_path, sr=self.sample_rate)
+        mel = librosa.feature.melspectrogram(y=y, sr=sr, n_mels=self.n_mels, hop_length=512)
+        log_mel = np.log1p(mel).astype(np.float32)
+
+        with torch.no_grad():
+            logits = self.model(torch.from_numpy(log_mel).unsqueeze(0))[0]
+
+        # Pool frames into token slots, then collapse repeats and blanks (CTC style)
+        n_slots = max(1, logits.shape[1] // self.frames_per_token)
+        pooled = logits[:, :n_slots * self.frames_per_token].reshape(len(SPEECH_VOCAB), n_slots, -1).mean(dim=2)
+        ids = pooled.argmax(dim=0).tolist()
+
+        words = []
+        previous = None
+        for idx in ids:
+            if idx != previous and idx != 0:
+                words.append(SPEECH_VOCAB[idx])
+            previous = idx
+
+        return {"text": " ".join(words) or "okay"}
+
+
+def build_tiny_pipelines(seed=0):
+    """Return (sentiment, emotion, speech) stand-ins matching ``main.py``'s pipelines."""
+    sentiment = TinyTextPipeline(SENTIMENT_LABELS, seed=seed)
+    emotion = TinyTextPipeline(EMOTION_LABELS, top_k=3, seed=seed + 1)
+    speech = TinySpeechPipeline(seed=seed + 2)
+    return sentiment, emotion, speech